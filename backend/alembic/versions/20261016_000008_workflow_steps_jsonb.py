@@ -0,0 +1,37 @@
+"""Store workflow_steps as JSONB.
+
+Revision ID: 20261016_000008
+Revises: 20260201_000007
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20261016_000008"
+down_revision = "20260201_000007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite keeps JSON as text, so only Postgres needs the type change.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # The '[]' text default can't be cast automatically; drop it around the type change.
+    op.execute("ALTER TABLE projects ALTER COLUMN workflow_steps DROP DEFAULT")
+    op.execute(
+        "ALTER TABLE projects ALTER COLUMN workflow_steps TYPE jsonb "
+        "USING NULLIF(btrim(workflow_steps), '')::jsonb"
+    )
+    op.execute("ALTER TABLE projects ALTER COLUMN workflow_steps SET DEFAULT '[]'::jsonb")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER TABLE projects ALTER COLUMN workflow_steps DROP DEFAULT")
+    op.execute("ALTER TABLE projects ALTER COLUMN workflow_steps TYPE text USING workflow_steps::text")
+    op.execute("ALTER TABLE projects ALTER COLUMN workflow_steps SET DEFAULT '[]'")
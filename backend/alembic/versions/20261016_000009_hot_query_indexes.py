@@ -0,0 +1,52 @@
+"""Indexes for hot project/task/asset queries.
+
+Revision ID: 20261016_000009
+Revises: 20261016_000008
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20261016_000009"
+down_revision = "20261016_000008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # list_projects: WHERE user_id = ? ORDER BY updated_at DESC
+    op.create_index(
+        "ix_projects_user_updated",
+        "projects",
+        ["user_id", sa.text("updated_at DESC")],
+        unique=False,
+    )
+    # _ensure_no_active_tasks: WHERE project_id = ? AND status IN ('QUEUED', 'RUNNING')
+    op.create_index(
+        "ix_tasks_project_active",
+        "tasks",
+        ["project_id"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')"),
+    )
+    # list_project_results: successful tasks of a project -> result asset ids
+    op.create_index(
+        "ix_tasks_project_success_result",
+        "tasks",
+        ["project_id", "result_asset_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'SUCCESS'"),
+    )
+    # Result retention cleanup / recent-results cutoffs.
+    op.create_index("ix_assets_created_at", "assets", [sa.text("created_at DESC")], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assets_created_at", table_name="assets")
+    op.drop_index("ix_tasks_project_success_result", table_name="tasks")
+    op.drop_index("ix_tasks_project_active", table_name="tasks")
+    op.drop_index("ix_projects_user_updated", table_name="projects")
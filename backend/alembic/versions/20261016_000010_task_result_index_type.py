@@ -0,0 +1,41 @@
+"""Include task_type in the successful-results index.
+
+Revision ID: 20261016_000010
+Revises: 20261016_000009
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20261016_000010"
+down_revision = "20261016_000009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # list_project_results filters on task_type as well; keep result_asset_id last so the
+    # join to assets is still answered from the index.
+    op.drop_index("ix_tasks_project_success_result", table_name="tasks")
+    op.create_index(
+        "ix_tasks_project_success_result",
+        "tasks",
+        ["project_id", "task_type", "result_asset_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'SUCCESS'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_project_success_result", table_name="tasks")
+    op.create_index(
+        "ix_tasks_project_success_result",
+        "tasks",
+        ["project_id", "result_asset_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'SUCCESS'"),
+    )
@@ -0,0 +1,34 @@
+"""Replace the tasks.project_id index with (project_id, created_at DESC).
+
+Revision ID: 20261016_000011
+Revises: 20261016_000010
+Create Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "20261016_000011"
+down_revision = "20261016_000010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # get_project_tasks: WHERE project_id = ? ORDER BY created_at DESC. The composite index
+    # also serves every plain project_id lookup (FK cascade), so the old one is redundant.
+    op.create_index(
+        "ix_tasks_project_created",
+        "tasks",
+        ["project_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.drop_index("ix_tasks_project_id", table_name="tasks")
+
+
+def downgrade() -> None:
+    op.create_index("ix_tasks_project_id", "tasks", ["project_id"], unique=False)
+    op.drop_index("ix_tasks_project_created", table_name="tasks")
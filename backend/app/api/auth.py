@@ -1,18 +1,22 @@
 """Authentication API routes."""
-from fastapi import APIRouter, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.api.deps import DbSession, CurrentUser
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
 from app.services.auth_service import AuthService
-from app.utils.rate_limiter import limiter
+from app.services.user_cache import invalidate_user
+from app.utils.rate_limiter import TokenBucketLimiter
 
 router = APIRouter()
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-@limiter.limit("5/minute")
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(TokenBucketLimiter(capacity=5, refill_per_sec=5 / 60))],
+)
 async def register(
-    request: Request,
     user_data: UserCreate,
     db: DbSession,
 ):
@@ -29,10 +33,12 @@ async def register(
         )
 
 
-@router.post("/login", response_model=Token)
-@limiter.limit("10/minute")
+@router.post(
+    "/login",
+    response_model=Token,
+    dependencies=[Depends(TokenBucketLimiter(capacity=10, refill_per_sec=10 / 60))],
+)
 async def login(
-    request: Request,
     credentials: UserLogin,
     db: DbSession,
 ):
@@ -51,13 +57,17 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Start the new session from fresh user state.
+    await invalidate_user(user.id)
     return auth_service.create_tokens(user)
 
 
-@router.post("/refresh", response_model=Token)
-@limiter.limit("30/minute")
+@router.post(
+    "/refresh",
+    response_model=Token,
+    dependencies=[Depends(TokenBucketLimiter(capacity=30, refill_per_sec=30 / 60))],
+)
 async def refresh_token(
-    request: Request,
     refresh_token: str,
     db: DbSession,
 ):
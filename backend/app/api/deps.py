@@ -1,13 +1,15 @@
 """API dependencies."""
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
+from app.services.user_cache import cache_user, get_cached_user
+from app.utils.rate_limiter import TokenBucketLimiter
 from app.utils.security import get_user_id_from_token
 
 # Security scheme
@@ -29,10 +31,14 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    user = await get_cached_user(db, user_id)
+    if user is None:
+        result = await db.execute(
+            select(User).where(User.id == user_id)
+        )
+        user = result.scalar_one_or_none()
+        if user is not None:
+            await cache_user(user)
 
     if user is None:
         raise HTTPException(
@@ -60,3 +66,14 @@ async def get_current_active_user(
 # Type aliases for cleaner dependency injection
 CurrentUser = Annotated[User, Depends(get_current_user)]
 DbSession = Annotated[AsyncSession, Depends(get_db)]
+
+
+class UserTokenBucketLimiter(TokenBucketLimiter):
+    """`TokenBucketLimiter` keyed on the authenticated user instead of the client IP.
+
+    Users behind one NAT or proxy each get their own budget. The user comes from the
+    same (per-request cached) dependency as the route's CurrentUser.
+    """
+
+    async def __call__(self, request: Request, current_user: CurrentUser) -> None:
+        await self.consume(request, f"user:{current_user.id}")
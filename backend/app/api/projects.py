@@ -1,11 +1,17 @@
 """Project management API routes."""
-import json
+import asyncio
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
-from fastapi import APIRouter, HTTPException, status, Query, BackgroundTasks
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from fastapi import APIRouter, HTTPException, status, Query, BackgroundTasks, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select, func, update
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
 from app.api.deps import DbSession, CurrentUser
+from app.api.tasks import _PROJECT_RESULT_FIELD, _get_assets_by_id, submit_and_poll_task
+from app.config import get_settings
+from app.database import async_session_maker
 from app.models.project import Project, ProjectStatus
 from app.models.task import Task, TaskStatus, TaskType
 from app.models.asset import Asset
@@ -16,10 +22,20 @@ from app.schemas.project import (
     ProjectResponse,
     ProjectListResponse,
 )
+from app.services.background import BackgroundService
+from app.services.try_on import TryOnService
+from app.services.video import VideoService
+from app.tasks.pipeline import run_project_pipeline
 
+settings = get_settings()
 router = APIRouter()
 
+_ASSET_LIST_ADAPTER = TypeAdapter(list[AssetResponse])
+
 _BASE_STEP_ORDER = ["try_on", "background", "video"]
+_VALID_STEPS = frozenset(_BASE_STEP_ORDER)
+# One bit per step so "which steps are enabled" checks are plain int ops.
+_STEP_BITS = {s: 1 << i for i, s in enumerate(_BASE_STEP_ORDER)}
 _STEP_OUTPUT_TYPE = {
     "try_on": "image",
     "background": "image",
@@ -30,108 +46,141 @@ _STEP_PERSON_INPUT_TYPE = {
     "background": "image",
     "video": "image",
 }
-_STEP_RESULT_ATTR = {
-    "try_on": "try_on_result_id",
-    "background": "background_result_id",
-    "video": "video_result_id",
-}
+_PERSON_SOURCE_VALID = frozenset({"upstream", "model_image"})
+
+# Loader options are immutable; build them once instead of per request.
+# Single-project responses serialize all seven asset briefs, so they are joined into the
+# project query; anything else (user, tasks) is never touched and must not lazy-load.
+_PROJECT_RESPONSE_LOAD = (
+    joinedload(Project.model_image),
+    joinedload(Project.clothing_image),
+    joinedload(Project.background_image),
+    joinedload(Project.reference_video),
+    joinedload(Project.try_on_result),
+    joinedload(Project.background_result),
+    joinedload(Project.video_result),
+    raiseload("*"),
+)
+# Page of projects: one batched IN query per relationship.
+_PROJECT_LIST_LOAD = (
+    selectinload(Project.model_image),
+    selectinload(Project.clothing_image),
+    selectinload(Project.background_image),
+    selectinload(Project.reference_video),
+    selectinload(Project.try_on_result),
+    selectinload(Project.background_result),
+    selectinload(Project.video_result),
+)
 
 
 def _normalize_person_source(value: str | None) -> str | None:
     if value is None:
         return None
+    if value in _PERSON_SOURCE_VALID:
+        return value
     v = value.strip().lower()
     if not v:
         return None
-    if v in ("upstream", "model_image"):
+    if v in _PERSON_SOURCE_VALID:
         return v
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid person source mode.")
 
 
-def _parse_steps(value: str | None) -> list[str] | None:
-    if not value:
-        return None
-    try:
-        parsed = json.loads(value)
-        if isinstance(parsed, list):
-            return [str(s) for s in parsed]
-    except Exception:
-        return None
-    return None
+def _enabled_mask(try_on: bool | None, background: bool | None, video: bool | None) -> int:
+    return (
+        (_STEP_BITS["try_on"] if try_on else 0)
+        | (_STEP_BITS["background"] if background else 0)
+        | (_STEP_BITS["video"] if video else 0)
+    )
+
+
+def _project_enabled_mask(p: Project) -> int:
+    return _enabled_mask(p.enable_try_on, p.enable_background, p.enable_video)
 
 
-def _default_steps_for_project(p: Project) -> list[str]:
-    enabled = {
-        "try_on": bool(p.enable_try_on),
-        "background": bool(p.enable_background),
-        "video": bool(p.enable_video),
-    }
-    return [s for s in _BASE_STEP_ORDER if enabled.get(s)]
+def _steps_mask(steps) -> int:
+    mask = 0
+    for s in steps:
+        mask |= _STEP_BITS[s]
+    return mask
 
 
-def _steps_for_project(p: Project) -> list[str]:
+@lru_cache(maxsize=64)
+def _validate_workflow(steps: tuple[str, ...], enabled_mask: int) -> str | None:
+    """Return an error detail if `steps` isn't an ordering of exactly the enabled steps."""
+    invalid = [s for s in steps if s not in _VALID_STEPS]
+    if invalid:
+        return f"Invalid workflow step(s): {invalid}"
+    # Equal masks plus one entry per set bit: exactly the enabled steps, no duplicates.
+    if _steps_mask(steps) != enabled_mask or len(steps) != bin(enabled_mask).count("1"):
+        return "workflow_steps must contain exactly the enabled steps (no more, no less)."
+    return None
+
+
+def _steps_for_project(p: Project) -> tuple[str, ...]:
     """Return the configured workflow order (filtered to enabled steps)."""
-    configured = _parse_steps(getattr(p, "workflow_steps", None))
+    configured = getattr(p, "workflow_steps", None)
+    if not configured or not isinstance(configured, list):
+        return _steps_for_config(None, _project_enabled_mask(p))
+    return _steps_for_config(tuple(str(s) for s in configured), _project_enabled_mask(p))
+
+
+@lru_cache(maxsize=1024)
+def _steps_for_config(configured: tuple[str, ...] | None, enabled: int) -> tuple[str, ...]:
+    # Pure in (stored order, enabled mask), so edits to either are a different cache key.
     if not configured:
-        return _default_steps_for_project(p)
-
-    enabled = {
-        "try_on": bool(p.enable_try_on),
-        "background": bool(p.enable_background),
-        "video": bool(p.enable_video),
-    }
-    seen: set[str] = set()
+        return tuple(s for s in _BASE_STEP_ORDER if _STEP_BITS[s] & enabled)
+
+    seen = 0
     out: list[str] = []
     for s in configured:
-        if s in enabled and enabled[s] and s not in seen:
+        bit = _STEP_BITS.get(s, 0)
+        if bit & enabled and not bit & seen:
             out.append(s)
-            seen.add(s)
+            seen |= bit
 
     # Ensure we don't "lose" newly enabled steps.
     for s in _BASE_STEP_ORDER:
-        if enabled.get(s) and s not in seen:
+        bit = _STEP_BITS[s]
+        if bit & enabled and not bit & seen:
             out.append(s)
-            seen.add(s)
-    return out
+            seen |= bit
+    return tuple(out)
+
+
+@lru_cache(maxsize=None)
+def _step_positions(steps: tuple[str, ...]) -> dict[str, int]:
+    """Map each step to its index. There are only a handful of possible orders."""
+    return {s: i for i, s in enumerate(steps)}
 
 
 def _result_id_for_step(p: Project, step: str) -> int | None:
-    attr = _STEP_RESULT_ATTR.get(step)
+    attr = _PROJECT_RESULT_FIELD.get(step)
     if not attr:
         return None
     return getattr(p, attr, None)
 
 
-def _find_upstream_result_id(p: Project, steps: list[str], step: str) -> int | None:
+def _find_upstream(p: Project, steps: tuple[str, ...], step: str) -> tuple[int | None, bool]:
+    """Return (nearest upstream result id, whether any upstream step exists) in one scan."""
     input_type = _STEP_PERSON_INPUT_TYPE.get(step)
-    if not input_type or step not in steps:
-        return None
-    idx = steps.index(step)
-    for prev in reversed(steps[:idx]):
+    idx = _step_positions(steps).get(step)
+    if not input_type or idx is None:
+        return None, False
+    has_upstream = False
+    for i in range(idx - 1, -1, -1):
+        prev = steps[i]
         if _STEP_OUTPUT_TYPE.get(prev) != input_type:
             continue
+        has_upstream = True
         result_id = _result_id_for_step(p, prev)
         if result_id:
-            return result_id
-    return None
+            return result_id, True
+    return None, has_upstream
 
 
-def _has_upstream_step(steps: list[str], step: str) -> bool:
-    input_type = _STEP_PERSON_INPUT_TYPE.get(step)
-    if not input_type or step not in steps:
-        return False
-    idx = steps.index(step)
-    for prev in reversed(steps[:idx]):
-        if _STEP_OUTPUT_TYPE.get(prev) == input_type:
-            return True
-    return False
-
-
-def _resolve_person_source_id(p: Project, steps: list[str], step: str) -> int | None:
+def _resolve_person_source_id(p: Project, steps: tuple[str, ...], step: str) -> int | None:
     """Resolve the person image source for a step based on user preference."""
-    upstream_id = _find_upstream_result_id(p, steps, step)
-    has_upstream = _has_upstream_step(steps, step)
-
     if step == "background":
         raw = (getattr(p, "background_person_source", None) or "try_on_result").lower()
         mode = "model_image" if raw == "model_image" else "upstream"
@@ -144,6 +193,8 @@ def _resolve_person_source_id(p: Project, steps: list[str], step: str) -> int |
 
     if mode == "model_image":
         return p.model_image_id
+
+    upstream_id, has_upstream = _find_upstream(p, steps, step)
     if mode == "upstream":
         return upstream_id if has_upstream else p.model_image_id
 
@@ -161,37 +212,35 @@ async def list_projects(
     """List all projects for current user."""
     offset = (page - 1) * page_size
 
-    # Get total count
-    count_result = await db.execute(
-        select(func.count(Project.id)).where(Project.user_id == current_user.id)
-    )
-    total = count_result.scalar_one()
-
-    # Get projects with relationships
+    # Get projects with relationships; the window count returns the total in the same query.
     result = await db.execute(
-        select(Project)
+        select(Project, func.count().over().label("total"))
         .where(Project.user_id == current_user.id)
-        .options(
-            selectinload(Project.model_image),
-            selectinload(Project.clothing_image),
-            selectinload(Project.background_image),
-            selectinload(Project.reference_video),
-            selectinload(Project.try_on_result),
-            selectinload(Project.background_result),
-            selectinload(Project.video_result),
-        )
+        .options(*_PROJECT_LIST_LOAD)
         .order_by(Project.updated_at.desc())
         .offset(offset)
         .limit(page_size)
     )
-    projects = result.scalars().all()
+    rows = result.all()
+    projects = [row[0] for row in rows]
 
-    return ProjectListResponse(
-        projects=[ProjectResponse.model_validate(p) for p in projects],
-        total=total,
-        page=page,
-        page_size=page_size,
-    )
+    if rows:
+        total = rows[0].total
+    elif offset == 0:
+        total = 0
+    else:
+        # Page past the end: no rows to carry the window count, fall back to COUNT.
+        count_result = await db.execute(
+            select(func.count(Project.id)).where(Project.user_id == current_user.id)
+        )
+        total = count_result.scalar_one()
+
+    # Validate + serialize in one pydantic pass and return the bytes directly; returning the
+    # model would make FastAPI validate it again and re-encode it through jsonable_encoder.
+    body = ProjectListResponse.model_validate(
+        {"projects": projects, "total": total, "page": page, "page_size": page_size}
+    ).model_dump_json()
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -204,32 +253,23 @@ async def create_project(
     if not (project_data.enable_try_on or project_data.enable_background or project_data.enable_video):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one workflow must be enabled.")
 
-    enabled_steps = {
-        "try_on": bool(project_data.enable_try_on),
-        "background": bool(project_data.enable_background),
-        "video": bool(project_data.enable_video),
-    }
-    enabled_set = {k for k, v in enabled_steps.items() if v}
+    enabled_mask = _enabled_mask(project_data.enable_try_on, project_data.enable_background, project_data.enable_video)
 
     steps = project_data.workflow_steps
     if steps is None:
-        steps = [s for s in _BASE_STEP_ORDER if enabled_steps.get(s)]
+        steps = [s for s in _BASE_STEP_ORDER if _STEP_BITS[s] & enabled_mask]
     else:
         steps = [str(s) for s in steps]
-        invalid = [s for s in steps if s not in _BASE_STEP_ORDER]
-        if invalid:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid workflow step(s): {invalid}")
-        if set(steps) != enabled_set:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="workflow_steps must contain exactly the enabled steps (no more, no less).",
-            )
+        error = _validate_workflow(tuple(steps), enabled_mask)
+        if error:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
     if project_data.background_person_source:
         bg_src = project_data.background_person_source.strip().lower()
     else:
-        if project_data.enable_try_on and project_data.enable_background and ("try_on" in steps and "background" in steps):
-            bg_src = "try_on_result" if steps.index("try_on") < steps.index("background") else "model_image"
+        positions = _step_positions(tuple(steps))
+        if project_data.enable_try_on and project_data.enable_background and ("try_on" in positions and "background" in positions):
+            bg_src = "try_on_result" if positions["try_on"] < positions["background"] else "model_image"
         else:
             bg_src = "try_on_result" if project_data.enable_try_on else "model_image"
     if bg_src not in ("try_on_result", "model_image"):
@@ -245,7 +285,7 @@ async def create_project(
         enable_try_on=project_data.enable_try_on,
         enable_background=project_data.enable_background,
         enable_video=project_data.enable_video,
-        workflow_steps=json.dumps(steps),
+        workflow_steps=steps,
         background_person_source=bg_src,
         try_on_person_source=try_on_src,
         video_person_source=video_src,
@@ -257,7 +297,6 @@ async def create_project(
     )
     db.add(project)
     await db.flush()
-    await db.refresh(project)
 
     return project
 
@@ -272,15 +311,7 @@ async def get_project(
     result = await db.execute(
         select(Project)
         .where(Project.id == project_id, Project.user_id == current_user.id)
-        .options(
-            selectinload(Project.model_image),
-            selectinload(Project.clothing_image),
-            selectinload(Project.background_image),
-            selectinload(Project.reference_video),
-            selectinload(Project.try_on_result),
-            selectinload(Project.background_result),
-            selectinload(Project.video_result),
-        )
+        .options(*_PROJECT_RESPONSE_LOAD)
     )
     project = result.scalar_one_or_none()
 
@@ -300,33 +331,46 @@ async def list_project_results(
     db: DbSession,
     task_type: TaskType | None = Query(None),
     days: int = Query(7, ge=1, le=365),
+    limit: int = Query(200, ge=1, le=500),
+    offset: int = Query(0, ge=0),
 ):
     """List successful workflow results for a project within the last N days."""
-    from datetime import datetime, timedelta, timezone
-
-    # Verify project access
-    project_check = await db.execute(
-        select(Project.id).where(Project.id == project_id, Project.user_id == current_user.id)
-    )
-    if project_check.scalar_one_or_none() is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    # Let the database compute the cutoff from its own clock.
+    cutoff = func.now() - timedelta(days=days)
 
+    # Ownership is enforced by the Project join, so the common case is a single query.
     stmt = (
         select(Asset)
         .join(Task, Task.result_asset_id == Asset.id)
+        .join(Project, Project.id == Task.project_id)
         .where(Task.project_id == project_id)
+        .where(Project.user_id == current_user.id)
         .where(Task.status == TaskStatus.SUCCESS)
         .where(Asset.created_at >= cutoff)
         .order_by(Asset.created_at.desc())
     )
     if task_type is not None:
         stmt = stmt.where(Task.task_type == task_type)
+    stmt = stmt.limit(limit).offset(offset)
 
     result = await db.execute(stmt)
     assets = result.scalars().all()
-    return [AssetResponse.model_validate(a) for a in assets]
+
+    if not assets:
+        # Tell "no results yet" apart from a missing / foreign project.
+        owned = await db.scalar(
+            select(
+                select(Project.id)
+                .where(Project.id == project_id, Project.user_id == current_user.id)
+                .exists()
+            )
+        )
+        if not owned:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    # Validate the whole list in one pydantic-core pass and return the encoded body directly.
+    body = _ASSET_LIST_ADAPTER.dump_json(_ASSET_LIST_ADAPTER.validate_python(assets, from_attributes=True))
+    return Response(content=body, media_type="application/json")
 
 
 @router.patch("/{project_id}", response_model=ProjectResponse)
@@ -340,15 +384,7 @@ async def update_project(
     result = await db.execute(
         select(Project)
         .where(Project.id == project_id, Project.user_id == current_user.id)
-        .options(
-            selectinload(Project.model_image),
-            selectinload(Project.clothing_image),
-            selectinload(Project.background_image),
-            selectinload(Project.reference_video),
-            selectinload(Project.try_on_result),
-            selectinload(Project.background_result),
-            selectinload(Project.video_result),
-        )
+        .options(*_PROJECT_RESPONSE_LOAD)
     )
     project = result.scalar_one_or_none()
 
@@ -392,66 +428,69 @@ async def update_project(
         project.video_height = update_data.video_height
 
     if update_data.workflow_steps is not None:
-        enabled = {
-            "try_on": bool(project.enable_try_on),
-            "background": bool(project.enable_background),
-            "video": bool(project.enable_video),
-        }
-        enabled_set = {k for k, v in enabled.items() if v}
         steps = [str(s) for s in update_data.workflow_steps]
-        invalid = [s for s in steps if s not in _BASE_STEP_ORDER]
-        if invalid:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid workflow step(s): {invalid}")
-        if set(steps) != enabled_set:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="workflow_steps must contain exactly the enabled steps (no more, no less).",
-            )
-        project.workflow_steps = json.dumps(steps)
+        error = _validate_workflow(tuple(steps), _project_enabled_mask(project))
+        if error:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+        project.workflow_steps = steps
     elif flags_changed:
         # Keep stored order consistent when the enabled steps set changes.
-        project.workflow_steps = json.dumps(_steps_for_project(project))
+        project.workflow_steps = list(_steps_for_project(project))
 
     # If try-on is disabled, background can't use try-on result as its source.
     if not project.enable_try_on and (project.background_person_source or "").lower() == "try_on_result":
         project.background_person_source = "model_image"
+    # Changing an asset FK leaves the already-loaded relationship stale; track which to reload.
+    stale_relationships: list[str] = []
     if "model_image_id" in update_data.model_fields_set:
         project.model_image_id = update_data.model_image_id
+        stale_relationships.append("model_image")
     if "clothing_image_id" in update_data.model_fields_set:
         project.clothing_image_id = update_data.clothing_image_id
+        stale_relationships.append("clothing_image")
     if "background_image_id" in update_data.model_fields_set:
         project.background_image_id = update_data.background_image_id
+        stale_relationships.append("background_image")
     if "reference_video_id" in update_data.model_fields_set:
         project.reference_video_id = update_data.reference_video_id
+        stale_relationships.append("reference_video")
 
+    # eager_defaults: the UPDATE returns updated_at, so only changed relationships need a reload.
     await db.flush()
-    await db.refresh(project)
+    if stale_relationships:
+        await db.refresh(project, attribute_names=stale_relationships)
     return project
 
 
 async def _ensure_no_active_tasks(project_id: int, db: DbSession) -> None:
-    res = await db.execute(
-        select(func.count(Task.id))
-        .where(Task.project_id == project_id)
-        .where(Task.status.in_([TaskStatus.QUEUED, TaskStatus.RUNNING]))
+    # EXISTS stops at the first active task (served by ix_tasks_project_active).
+    active = await db.scalar(
+        select(
+            select(Task.id)
+            .where(Task.project_id == project_id)
+            .where(Task.status.in_([TaskStatus.QUEUED, TaskStatus.RUNNING]))
+            .exists()
+        )
     )
-    if (res.scalar_one() or 0) > 0:
+    if active:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Project has a running task. Please wait for it to finish.",
         )
 
 
-async def _run_project_pipeline(project_id: int) -> None:
-    """Run enabled workflow steps sequentially in the background."""
-    from datetime import datetime, timezone
+async def _ensure_no_active_tasks_concurrently(project_id: int) -> None:
+    """Run `_ensure_no_active_tasks` on its own pooled connection.
+
+    An AsyncSession can't run two statements at once, so this lets callers overlap the
+    check with a query on the request session (needs pool_size >= 2x concurrent requests).
+    """
+    async with async_session_maker() as db:
+        await _ensure_no_active_tasks(project_id, db)
 
-    from app.database import async_session_maker
-    from app.services.try_on import TryOnService
-    from app.services.background import BackgroundService
-    from app.services.video import VideoService
-    from app.api.tasks import submit_and_poll_task
 
+async def _run_project_pipeline(project_id: int) -> None:
+    """Run enabled workflow steps sequentially in the background."""
     async with async_session_maker() as db:
         async def load_project() -> Project | None:
             # IMPORTANT: the pipeline runs in its own session, but step execution
@@ -460,6 +499,7 @@ async def _run_project_pipeline(project_id: int) -> None:
             res = await db.execute(
                 select(Project)
                 .where(Project.id == project_id)
+                .options(raiseload("*"))
                 .execution_options(populate_existing=True)
             )
             return res.scalar_one_or_none()
@@ -468,50 +508,68 @@ async def _run_project_pipeline(project_id: int) -> None:
         if not project:
             return
 
-        def mark_update(p: Project, **kwargs):
-            for k, v in kwargs.items():
-                setattr(p, k, v)
-            p.pipeline_updated_at = datetime.now(timezone.utc)
+        async def finish(final_status: ProjectStatus, **values) -> None:
+            # Terminal state is written blind: nothing needs the current row, so skip the
+            # reload and issue a single UPDATE (a deleted project just matches no rows).
+            await db.execute(
+                update(Project)
+                .where(Project.id == project_id)
+                .values(
+                    pipeline_active=False,
+                    pipeline_current_step=None,
+                    status=final_status,
+                    pipeline_updated_at=func.now(),
+                    **values,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
 
         steps = _steps_for_project(project)
 
         start = project.pipeline_start_step or (steps[0] if steps else None)
         if not start or start not in steps:
-            mark_update(project, pipeline_active=False, pipeline_last_error="No enabled workflow steps to run.", pipeline_current_step=None)
-            project.status = ProjectStatus.FAILED
-            await db.commit()
+            await finish(ProjectStatus.FAILED, pipeline_last_error="No enabled workflow steps to run.")
             return
 
-        start_idx = steps.index(start)
-        run_steps = steps[start_idx:]
+        run_steps = steps[_step_positions(steps)[start]:]
         if not project.pipeline_chain:
-            run_steps = [start]
+            run_steps = (start,)
 
         try:
             for step in run_steps:
-                # Reload to see latest results written by other sessions.
-                project = await load_project()
-                if not project:
-                    return
+                # Mark the step as started and reload the project (to see results written
+                # by other sessions) in one UPDATE ... RETURNING. The cancel flag is part of
+                # the WHERE clause, so no row back means the user requested cancel.
+                # Expiring first makes the RETURNING row repopulate every column.
+                db.expire(project)
+                res = await db.execute(
+                    update(Project)
+                    .where(Project.id == project_id, Project.pipeline_cancel_requested.is_(False))
+                    .values(
+                        pipeline_current_step=step,
+                        status=ProjectStatus.PROCESSING,
+                        pipeline_updated_at=func.now(),
+                    )
+                    .returning(Project)
+                    .execution_options(synchronize_session=False)
+                )
+                project = res.scalar_one_or_none()
+                await db.commit()
 
                 # Stop before starting the next step if user requested cancel.
-                if project.pipeline_cancel_requested:
-                    mark_update(project, pipeline_active=False, pipeline_current_step=None)
-                    project.status = ProjectStatus.DRAFT
-                    await db.commit()
+                if project is None:
+                    await finish(ProjectStatus.DRAFT)
                     return
 
-                mark_update(project, pipeline_current_step=step)
-                project.status = ProjectStatus.PROCESSING
-                await db.commit()
-
                 # Create the task for this step using current project inputs/results.
                 if step == "try_on":
                     source_id = _resolve_person_source_id(project, steps, "try_on")
                     if not source_id or not project.clothing_image_id:
                         raise ValueError("Missing required assets: model_image (or upstream result) and clothing_image")
-                    model = await db.get(Asset, source_id)
-                    clothing = await db.get(Asset, project.clothing_image_id)
+                    assets = await _get_assets_by_id(db, [source_id, project.clothing_image_id])
+                    model = assets.get(source_id)
+                    clothing = assets.get(project.clothing_image_id)
                     if not model or not clothing:
                         raise ValueError("Asset not found")
                     svc = TryOnService(db)
@@ -527,8 +585,9 @@ async def _run_project_pipeline(project_id: int) -> None:
                         )
                     if not project.background_image_id:
                         raise ValueError("Missing required asset for background: background image")
-                    source = await db.get(Asset, source_id)
-                    bg = await db.get(Asset, project.background_image_id) if project.background_image_id else None
+                    assets = await _get_assets_by_id(db, [source_id, project.background_image_id])
+                    source = assets.get(source_id)
+                    bg = assets.get(project.background_image_id)
                     if not source:
                         raise ValueError("Asset not found")
                     svc = BackgroundService(db)
@@ -544,8 +603,9 @@ async def _run_project_pipeline(project_id: int) -> None:
                         )
                     if not project.reference_video_id:
                         raise ValueError("Missing required asset for video: reference video")
-                    person = await db.get(Asset, source_id)
-                    reference = await db.get(Asset, project.reference_video_id)
+                    assets = await _get_assets_by_id(db, [source_id, project.reference_video_id])
+                    person = assets.get(source_id)
+                    reference = assets.get(project.reference_video_id)
                     if not person or not reference:
                         raise ValueError("Asset not found")
                     if reference.asset_type != "reference_video":
@@ -565,20 +625,13 @@ async def _run_project_pipeline(project_id: int) -> None:
                     await submit_and_poll_task(task.id, "video")
 
             # Completed all planned steps.
-            project = await load_project()
-            if not project:
-                return
-            mark_update(project, pipeline_active=False, pipeline_current_step=None)
-            project.status = ProjectStatus.COMPLETED
-            await db.commit()
+            await finish(ProjectStatus.COMPLETED)
 
         except Exception as e:
-            project = await load_project()
-            if not project:
-                return
-            mark_update(project, pipeline_active=False, pipeline_current_step=None, pipeline_last_error=str(e))
-            project.status = ProjectStatus.FAILED
-            await db.commit()
+            # The session may be mid-transaction in a failed state; start clean so the
+            # FAILED state can actually be written.
+            await db.rollback()
+            await finish(ProjectStatus.FAILED, pipeline_last_error=str(e))
 
 
 @router.post("/{project_id}/pipeline/start", response_model=ProjectResponse)
@@ -591,24 +644,25 @@ async def start_pipeline(
     chain: bool = Query(True, description="When true, run subsequent enabled steps after start_step"),
 ):
     """Start sequential pipeline execution in the background."""
-    result = await db.execute(
+    # The active-task check doesn't depend on the project row; run both queries at once.
+    project_query = db.execute(
         select(Project)
         .where(Project.id == project_id, Project.user_id == current_user.id)
-        .options(
-            selectinload(Project.model_image),
-            selectinload(Project.clothing_image),
-            selectinload(Project.background_image),
-            selectinload(Project.reference_video),
-            selectinload(Project.try_on_result),
-            selectinload(Project.background_result),
-            selectinload(Project.video_result),
-        )
+        .options(*_PROJECT_RESPONSE_LOAD)
     )
+    result, active_check = await asyncio.gather(
+        project_query,
+        _ensure_no_active_tasks_concurrently(project_id),
+        return_exceptions=True,
+    )
+    if isinstance(result, BaseException):
+        raise result
     project = result.scalar_one_or_none()
+    # Report 404 before 409 so the check can't reveal state of other users' projects.
     if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-
-    await _ensure_no_active_tasks(project_id, db)
+    if isinstance(active_check, BaseException):
+        raise active_check
 
     steps = _steps_for_project(project)
 
@@ -649,8 +703,6 @@ async def start_pipeline(
                 detail="Missing required asset for background: background_image",
             )
 
-    from datetime import datetime, timezone
-
     project.pipeline_active = True
     project.pipeline_cancel_requested = False
     project.pipeline_chain = chain
@@ -661,8 +713,17 @@ async def start_pipeline(
     project.pipeline_updated_at = project.pipeline_started_at
     project.status = ProjectStatus.PROCESSING
     await db.flush()
-    await db.refresh(project)
 
+    if settings.celery_enabled:
+        # Commit first so the worker can't pick the job up before the pipeline state is visible.
+        await db.commit()
+        try:
+            await asyncio.to_thread(run_project_pipeline.delay, project.id)
+            return project
+        except Exception:
+            # Broker unreachable: the project is already committed as running and no
+            # worker would ever pick it up, so run the pipeline in-process instead.
+            pass
     background_tasks.add_task(_run_project_pipeline, project.id)
     return project
 
@@ -677,26 +738,15 @@ async def cancel_pipeline(
     result = await db.execute(
         select(Project)
         .where(Project.id == project_id, Project.user_id == current_user.id)
-        .options(
-            selectinload(Project.model_image),
-            selectinload(Project.clothing_image),
-            selectinload(Project.background_image),
-            selectinload(Project.reference_video),
-            selectinload(Project.try_on_result),
-            selectinload(Project.background_result),
-            selectinload(Project.video_result),
-        )
+        .options(*_PROJECT_RESPONSE_LOAD)
     )
     project = result.scalar_one_or_none()
     if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
-    from datetime import datetime, timezone
-
     project.pipeline_cancel_requested = True
     project.pipeline_updated_at = datetime.now(timezone.utc)
     await db.flush()
-    await db.refresh(project)
     return project
 
 
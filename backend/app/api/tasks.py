@@ -1,13 +1,21 @@
 """Task management API routes."""
+import asyncio
+import hashlib
+import time
+import uuid
 from datetime import datetime
-from pathlib import Path
-from urllib.parse import urlparse
-
-from fastapi import APIRouter, HTTPException, status, Request, BackgroundTasks
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-
-from app.api.deps import DbSession, CurrentUser
+from functools import lru_cache
+
+import aiofiles
+import aiofiles.os
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status, Request, BackgroundTasks, Response
+from pydantic import TypeAdapter
+from sqlalchemy import and_, lambda_stmt, select, update
+from sqlalchemy.orm import load_only, raiseload, selectinload
+
+from app.api.deps import DbSession, CurrentUser, UserTokenBucketLimiter
+from app.config import get_settings
 from app.models.asset import Asset, AssetType
 from app.models.project import Project
 from app.models.task import Task, TaskStatus
@@ -21,34 +29,48 @@ from app.schemas.task import (
 from app.services.try_on import TryOnService
 from app.services.background import BackgroundService
 from app.services.video import VideoService
+from app.services.response_cache import cache_body, get_cached_body, invalidate_body
 from app.services.usage_service import UsageService
-from app.utils.rate_limiter import limiter
+from app.tasks.ai_tasks import submit_and_poll
 
+settings = get_settings()
 router = APIRouter()
 
+_TASK_LIST_ADAPTER = TypeAdapter(list[TaskResponse])
+
 
 def _is_external_url(value: str | None) -> bool:
-    if not value:
-        return False
-    return value.startswith("http://") or value.startswith("https://")
+    return bool(value) and value.startswith(("http://", "https://"))
+
 
+# Filesystem/path separator and control chars -> "_", in a single translate pass.
+_FILENAME_BAD_CHARS = str.maketrans({ch: "_" for ch in '\\/:*?"<>|\r\n\t'})
 
+
+@lru_cache(maxsize=512)
 def _safe_filename_component(value: str) -> str:
     # Keep Unicode (project names), but remove filesystem/path separator and control chars.
-    bad = ['\\', '/', ':', '*', '?', '"', "<", ">", "|", "\r", "\n", "\t"]
-    out = value.strip()
-    for ch in bad:
-        out = out.replace(ch, "_")
+    out = value.strip().translate(_FILENAME_BAD_CHARS)
     out = " ".join(out.split())  # collapse whitespace
-    return out[:120] if len(out) > 120 else out
+    return out[:120]
+
+
+def _url_suffix(url: str) -> str:
+    """Return the lower-cased suffix of the URL's last path segment (like Path.suffix)."""
+    path = url.partition("#")[0].partition("?")[0]
+    scheme, sep, rest = path.partition("://")
+    if sep:
+        path = rest.partition("/")[2]  # drop the host
+    name = path.rpartition("/")[2]
+    dot = name.rfind(".")
+    return name[dot:].lower() if 0 < dot < len(name) - 1 else ""
 
 
 def _guess_ext(result_url: str | None, task_type: str, outputs: list[dict] | None = None) -> str:
     if result_url:
-        path = urlparse(result_url).path
-        ext = Path(path).suffix
+        ext = _url_suffix(result_url)
         if ext:
-            return ext.lower()
+            return ext
 
     if outputs:
         first = outputs[0] if outputs else None
@@ -62,15 +84,29 @@ def _guess_ext(result_url: str | None, task_type: str, outputs: list[dict] | Non
     return ".mp4" if task_type == "video" else ".png"
 
 
+_MIME_BY_EXT = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "mp4": "video/mp4",
+}
+
+
 def _mime_from_ext(ext: str) -> str:
-    ext = ext.lower().lstrip(".")
-    return {
-        "png": "image/png",
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "webp": "image/webp",
-        "mp4": "video/mp4",
-    }.get(ext, "application/octet-stream")
+    return _MIME_BY_EXT.get(ext.lower().lstrip("."), "application/octet-stream")
+
+
+_RESULT_ASSET_TYPE = {
+    "try_on": AssetType.TRY_ON_RESULT,
+    "background": AssetType.BACKGROUND_RESULT,
+    "video": AssetType.VIDEO_RESULT,
+}
+_PROJECT_RESULT_FIELD = {
+    "try_on": "try_on_result_id",
+    "background": "background_result_id",
+    "video": "video_result_id",
+}
 
 
 def _format_duration(seconds: int) -> str:
@@ -88,43 +124,165 @@ async def verify_project_access(
     project_id: int,
     user_id: int,
     db,
-) -> Project:
+) -> None:
     """Verify user has access to project."""
+    # Existence check only: select the key column rather than materializing a Project.
     result = await db.execute(
-        select(Project).where(
+        select(Project.id).where(
             Project.id == project_id,
             Project.user_id == user_id
         )
     )
-    project = result.scalar_one_or_none()
 
-    if project is None:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
-    return project
 
 
-async def get_asset(asset_id: int, user_id: int, db) -> Asset:
-    """Get asset and verify ownership."""
-    result = await db.execute(
-        select(Asset).where(Asset.id == asset_id, Asset.user_id == user_id)
+async def _get_assets_by_id(db, ids: list[int | None]) -> dict[int, Asset]:
+    """Load several assets in one `IN` query, keyed by id (missing ids are absent)."""
+    wanted = {i for i in ids if i}
+    if not wanted:
+        return {}
+    res = await db.execute(select(Asset).where(Asset.id.in_(wanted)))
+    return {a.id: a for a in res.scalars().all()}
+
+
+async def _gather_or_cancel(*coros):
+    """`asyncio.gather` that cancels (and awaits) the siblings when one awaitable fails.
+
+    Plain gather leaves them running, still streaming open files through the shared
+    RunningHub client after the caller has moved on to fail() and closed it.
+    """
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _attach_result_asset(
+    db,
+    task: Task,
+    task_type: str,
+    result_url: str,
+    outputs: list[dict] | None,
+) -> Asset | None:
+    """Create the result Asset of a finished task and point the task and project at it.
+
+    Shared by the poller and the webhook; the caller commits.
+    """
+    # Only the owner and the name (for the display filename) are needed.
+    project_result = await db.execute(
+        select(Project)
+        .where(Project.id == task.project_id)
+        .options(load_only(Project.id, Project.user_id, Project.name))
     )
-    asset = result.scalar_one_or_none()
+    project = project_result.scalar_one_or_none()
+    if project is None:
+        return None
+
+    # Use server *local* time for naming as requested.
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base = f"{_safe_filename_component(project.name)}_{task_type}_{ts}"
+    ext = _guess_ext(result_url, task_type, outputs=outputs)
+    display_name = f"{base}{ext}"
+
+    result_asset = Asset(
+        user_id=project.user_id,
+        filename=display_name,
+        display_name=display_name,
+        original_filename=display_name,
+        file_path=result_url,  # Store external URL
+        file_url=result_url,   # Use external URL directly
+        asset_type=_RESULT_ASSET_TYPE.get(task_type, AssetType.TRY_ON_RESULT),
+        mime_type=_mime_from_ext(ext),
+        file_size=0,  # Unknown for external URL
+    )
+    db.add(result_asset)
+    await db.flush()
+
+    task.result_asset_id = result_asset.id
+    field = _PROJECT_RESULT_FIELD.get(task_type)
+    if field:
+        setattr(project, field, result_asset.id)
+    return result_asset
+
+
+_PROJECT_TASKS_PAGE_SIZE = 100
+
 
-    if asset is None:
+def _project_tasks_cache_key(
+    user_id: int,
+    project_id: int,
+    limit: int = _PROJECT_TASKS_PAGE_SIZE,
+    offset: int = 0,
+) -> str:
+    # Keyed by user as well: a hit skips the ownership check. Writers only invalidate the
+    # default first page (the one the task panels poll); other pages expire via the TTL.
+    return f"tasks:project:{user_id}:{project_id}:{limit}:{offset}"
+
+
+async def _dispatch_submit_and_poll(db, background_tasks: BackgroundTasks, task_id: int, task_type: str) -> None:
+    """Hand the RunningHub submit/poll loop to the Celery worker (or run it in-process)."""
+    if settings.celery_enabled:
+        # Commit first so the worker can't pick the job up before the task row is visible.
+        await db.commit()
+        try:
+            await asyncio.to_thread(submit_and_poll.delay, task_id, task_type)
+            return
+        except Exception:
+            # Broker unreachable: the task is already committed as PENDING and nothing
+            # would ever claim it, so run it in-process instead.
+            pass
+    background_tasks.add_task(submit_and_poll_task, task_id, task_type)
+
+
+async def _get_project_and_assets(
+    db,
+    project_id: int,
+    user_id: int,
+    asset_ids: list[int],
+) -> tuple[Project, dict[int, Asset]]:
+    """Load an owned project and the user's input assets in one query.
+
+    Raises 404 for a missing project or asset, like verify_project_access.
+    """
+    result = await db.execute(
+        select(Project, Asset)
+        .outerjoin(Asset, and_(Asset.user_id == Project.user_id, Asset.id.in_(asset_ids)))
+        .where(Project.id == project_id, Project.user_id == user_id)
+    )
+    rows = result.all()
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Asset {asset_id} not found",
+            detail="Project not found",
         )
-    return asset
+
+    project = rows[0][0]
+    assets = {asset.id: asset for _, asset in rows if asset is not None}
+    for asset_id in asset_ids:
+        if asset_id not in assets:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Asset {asset_id} not found",
+            )
+    return project, assets
 
 
-@router.post("/try-on", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-@limiter.limit("10/minute")
+@router.post(
+    "/try-on",
+    response_model=TaskResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(UserTokenBucketLimiter(capacity=10, refill_per_sec=10 / 60))],
+)
 async def create_try_on_task(
-    request: Request,
     task_data: TryOnTaskCreate,
     current_user: CurrentUser,
     db: DbSession,
@@ -140,14 +298,18 @@ async def create_try_on_task(
             detail=error,
         )
 
-    # Verify project access + workflow enabled
-    project = await verify_project_access(task_data.project_id, current_user.id, db)
+    # Verify project access + workflow enabled, and load the input assets with it
+    project, assets = await _get_project_and_assets(
+        db,
+        task_data.project_id,
+        current_user.id,
+        [task_data.model_image_id, task_data.clothing_image_id],
+    )
     if not project.enable_try_on:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Try-on workflow is disabled for this project")
 
-    # Get assets
-    model_image = await get_asset(task_data.model_image_id, current_user.id, db)
-    clothing_image = await get_asset(task_data.clothing_image_id, current_user.id, db)
+    model_image = assets[task_data.model_image_id]
+    clothing_image = assets[task_data.clothing_image_id]
 
     # Create task
     try_on_service = TryOnService(db)
@@ -158,20 +320,19 @@ async def create_try_on_task(
     )
 
     # Submit to RunningHub in background
-    # Note: In production, this would be handled by Celery
-    background_tasks.add_task(
-        submit_and_poll_task,
-        task.id,
-        "try_on",
-    )
+    await _dispatch_submit_and_poll(db, background_tasks, task.id, "try_on")
+    await invalidate_body(_project_tasks_cache_key(current_user.id, task_data.project_id))
 
     return task
 
 
-@router.post("/background", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-@limiter.limit("10/minute")
+@router.post(
+    "/background",
+    response_model=TaskResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(UserTokenBucketLimiter(capacity=10, refill_per_sec=10 / 60))],
+)
 async def create_background_task(
-    request: Request,
     task_data: BackgroundTaskCreate,
     current_user: CurrentUser,
     db: DbSession,
@@ -186,18 +347,17 @@ async def create_background_task(
             detail=error,
         )
 
-    project = await verify_project_access(task_data.project_id, current_user.id, db)
+    asset_ids = [task_data.source_image_id]
+    if task_data.background_image_id:
+        asset_ids.append(task_data.background_image_id)
+    project, assets = await _get_project_and_assets(db, task_data.project_id, current_user.id, asset_ids)
     if not project.enable_background:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Background workflow is disabled for this project")
 
-    source_image = await get_asset(task_data.source_image_id, current_user.id, db)
+    source_image = assets[task_data.source_image_id]
     background_image = None
     if task_data.background_image_id:
-        background_image = await get_asset(
-            task_data.background_image_id,
-            current_user.id,
-            db
-        )
+        background_image = assets[task_data.background_image_id]
 
     background_service = BackgroundService(db)
     task = await background_service.create_task(
@@ -207,19 +367,19 @@ async def create_background_task(
         background_prompt=task_data.background_prompt,
     )
 
-    background_tasks.add_task(
-        submit_and_poll_task,
-        task.id,
-        "background",
-    )
+    await _dispatch_submit_and_poll(db, background_tasks, task.id, "background")
+    await invalidate_body(_project_tasks_cache_key(current_user.id, task_data.project_id))
 
     return task
 
 
-@router.post("/video", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-@limiter.limit("5/minute")
+@router.post(
+    "/video",
+    response_model=TaskResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(UserTokenBucketLimiter(capacity=5, refill_per_sec=5 / 60))],
+)
 async def create_video_task(
-    request: Request,
     task_data: VideoTaskCreate,
     current_user: CurrentUser,
     db: DbSession,
@@ -234,12 +394,17 @@ async def create_video_task(
             detail=error,
         )
 
-    project = await verify_project_access(task_data.project_id, current_user.id, db)
+    project, assets = await _get_project_and_assets(
+        db,
+        task_data.project_id,
+        current_user.id,
+        [task_data.person_image_id, task_data.reference_video_id],
+    )
     if not project.enable_video:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Video workflow is disabled for this project")
 
-    person_image = await get_asset(task_data.person_image_id, current_user.id, db)
-    reference_video = await get_asset(task_data.reference_video_id, current_user.id, db)
+    person_image = assets[task_data.person_image_id]
+    reference_video = assets[task_data.reference_video_id]
     if reference_video.asset_type != AssetType.REFERENCE_VIDEO:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -258,11 +423,8 @@ async def create_video_task(
         height=task_data.height,
     )
 
-    background_tasks.add_task(
-        submit_and_poll_task,
-        task.id,
-        "video",
-    )
+    await _dispatch_submit_and_poll(db, background_tasks, task.id, "video")
+    await invalidate_body(_project_tasks_cache_key(current_user.id, task_data.project_id))
 
     return task
 
@@ -272,19 +434,41 @@ async def get_project_tasks(
     project_id: int,
     current_user: CurrentUser,
     db: DbSession,
+    limit: int = Query(_PROJECT_TASKS_PAGE_SIZE, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    if_none_match: str | None = Header(None),
 ):
-    """Get all tasks for a project."""
-    # Verify project access
-    await verify_project_access(project_id, current_user.id, db)
+    """Get a project's tasks, newest first."""
+    # The task panels poll this; serve repeats from a short-lived cache and let clients
+    # revalidate with If-None-Match.
+    cache_key = _project_tasks_cache_key(current_user.id, project_id, limit, offset)
+    body = await get_cached_body(cache_key)
+    if body is None:
+        # Ownership is enforced by the Project join; TaskResponse has no relationships, so
+        # nothing should lazy-load from these rows.
+        result = await db.execute(
+            select(Task)
+            .join(Project, Project.id == Task.project_id)
+            .where(Task.project_id == project_id, Project.user_id == current_user.id)
+            .options(raiseload("*"))
+            .order_by(Task.created_at.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        tasks = result.scalars().all()
 
-    result = await db.execute(
-        select(Task)
-        .where(Task.project_id == project_id)
-        .order_by(Task.created_at.desc())
-    )
-    tasks = result.scalars().all()
+        if not tasks:
+            # Tell "no tasks yet" apart from a missing / foreign project.
+            await verify_project_access(project_id, current_user.id, db)
 
-    return tasks
+        body = _TASK_LIST_ADAPTER.dump_json(_TASK_LIST_ADAPTER.validate_python(tasks, from_attributes=True))
+        await cache_body(cache_key, body, settings.task_list_cache_ttl)
+
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
@@ -294,11 +478,12 @@ async def get_task(
     db: DbSession,
 ):
     """Get task details."""
-    result = await db.execute(
-        select(Task)
-        .join(Project)
-        .where(Task.id == task_id, Project.user_id == current_user.id)
-    )
+    # lambda_stmt caches the constructed statement per call site; only the bound values
+    # are extracted on each call.
+    user_id = current_user.id
+    stmt = lambda_stmt(lambda: select(Task).join(Project).options(raiseload("*")))
+    stmt += lambda s: s.where(Task.id == task_id, Project.user_id == user_id)
+    result = await db.execute(stmt)
     task = result.scalar_one_or_none()
 
     if task is None:
@@ -317,11 +502,26 @@ async def get_task_status(
     db: DbSession,
 ):
     """Get task status for polling."""
-    result = await db.execute(
-        select(Task)
+    # Polled every few seconds: only load the columns the status response needs, and
+    # reuse the cached statement (see get_task).
+    user_id = current_user.id
+    stmt = lambda_stmt(
+        lambda: select(Task)
         .join(Project)
-        .where(Task.id == task_id, Project.user_id == current_user.id)
+        .options(
+            load_only(
+                Task.id,
+                Task.status,
+                Task.progress_percent,
+                Task.result_url,
+                Task.thumbnail_url,
+                Task.error_message,
+            ),
+            raiseload("*"),
+        )
     )
+    stmt += lambda s: s.where(Task.id == task_id, Project.user_id == user_id)
+    result = await db.execute(stmt)
     task = result.scalar_one_or_none()
 
     if task is None:
@@ -353,86 +553,104 @@ async def get_task_status(
 
 async def submit_and_poll_task(task_id: int, task_type: str):
     """
-    Background function to submit task and poll for completion.
-    Runs as FastAPI BackgroundTask.
+    Submit task and poll for completion.
+    Runs on the Celery worker (app.tasks.ai_tasks.submit_and_poll), inside a project
+    pipeline, or as a FastAPI BackgroundTask when Celery is disabled.
     """
     from datetime import datetime, timezone
     from app.database import async_session_maker
-    from app.services.runninghub import RunningHubClient, get_app_config
+    from app.services.runninghub import RunningHubClient, get_app_config, step_timeout
     from app.config import get_settings
     from app.utils.storage import storage
-    import httpx
+    from contextlib import asynccontextmanager, suppress
 
     async with async_session_maker() as db:
-        # Get task from database
+        # Claim the task: a conditional UPDATE lets exactly one runner (e.g. of a duplicate
+        # delivery) move it out of PENDING, and returns the row in the same round trip.
         result = await db.execute(
-            select(Task).where(Task.id == task_id)
+            update(Task)
+            .where(Task.id == task_id, Task.status == TaskStatus.PENDING)
+            .values(status=TaskStatus.QUEUED, started_at=datetime.now(timezone.utc))
+            .returning(Task)
         )
         task = result.scalar_one_or_none()
-
         if task is None:
             return
-
-        if task.status != TaskStatus.PENDING:
-            return
+        await db.commit()
 
         client = RunningHubClient()
         app_config = get_app_config(task_type)
         settings = get_settings()
 
-        try:
-            # Update status to QUEUED
-            task.status = TaskStatus.QUEUED
-            task.started_at = datetime.now(timezone.utc)
+        async def fail(message: str) -> None:
+            # Terminal state: one commit records status, error and completion time together.
+            task.status = TaskStatus.FAILED
+            task.error_message = message
+            task.completed_at = datetime.now(timezone.utc)
             await db.commit()
 
+        try:
             # Upload images to RunningHub and build params
             params = {}
 
-            async def load_asset_bytes(asset: Asset) -> bytes:
-                """Load asset bytes from local storage or an external URL."""
-                # External results are stored as URLs; download then re-upload to RunningHub.
-                if _is_external_url(asset.file_path) or _is_external_url(asset.file_url):
-                    url = asset.file_url if _is_external_url(asset.file_url) else asset.file_path
-                    async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, read=300.0)) as http:
-                        resp = await http.get(url)
-                        resp.raise_for_status()
-                        return resp.content
+            @asynccontextmanager
+            async def open_asset(asset: Asset):
+                """Open asset content (local storage or external URL) as an async binary file.
 
-                local_path = storage.get_absolute_path(asset.file_path)
-                with open(local_path, "rb") as f:
-                    return f.read()
+                The upload streams the file in chunks, so a large reference video is never
+                held in memory as a whole; reads and writes run on aiofiles' thread pool.
+                """
+                # External results are stored as URLs; download then re-upload to RunningHub.
+                # Result URLs point at immutable files, so keep the download on disk and reuse
+                # it when the same result feeds another run.
+                url_is_external = _is_external_url(asset.file_url)
+                if url_is_external or _is_external_url(asset.file_path):
+                    url = asset.file_url if url_is_external else asset.file_path
+                    cache_path = storage.external_cache_path(url)
+                    if not await aiofiles.os.path.exists(cache_path):
+                        await aiofiles.os.makedirs(cache_path.parent, exist_ok=True)
+                        # Download beside the cache entry and rename it into place, so a
+                        # failed or concurrent download never leaves a partial file behind.
+                        tmp_path = cache_path.with_name(f".{cache_path.name}.{uuid.uuid4().hex}.part")
+                        try:
+                            async with aiofiles.open(tmp_path, "wb") as tmp:
+                                await client.download_to(url, tmp)
+                            await aiofiles.os.replace(tmp_path, cache_path)
+                        except BaseException:
+                            with suppress(FileNotFoundError):
+                                await aiofiles.os.remove(tmp_path)
+                            raise
+                    path = cache_path
+                else:
+                    path = storage.get_absolute_path(asset.file_path)
+
+                async with aiofiles.open(path, "rb") as f:
+                    yield f
+
+            async def upload_asset(asset: Asset) -> str | None:
+                async with open_asset(asset) as f:
+                    return await client.upload_file(f, asset.filename)
 
             if task_type == "try_on":
                 # Get assets to read files
-                model_asset = await db.execute(
-                    select(Asset).where(Asset.id == task.input_params.get("model_image_id"))
-                )
-                model_asset = model_asset.scalar_one_or_none()
-                clothing_asset = await db.execute(
-                    select(Asset).where(Asset.id == task.input_params.get("clothing_image_id"))
-                )
-                clothing_asset = clothing_asset.scalar_one_or_none()
+                model_id = task.input_params.get("model_image_id")
+                clothing_id = task.input_params.get("clothing_image_id")
+                assets = await _get_assets_by_id(db, [model_id, clothing_id])
+                model_asset = assets.get(model_id)
+                clothing_asset = assets.get(clothing_id)
 
                 if not model_asset or not clothing_asset:
-                    task.status = TaskStatus.FAILED
-                    task.error_message = "Asset not found"
-                    task.completed_at = datetime.now(timezone.utc)
-                    await db.commit()
+                    await fail("Asset not found")
                     return
 
-                # Read (local or external) and upload images to RunningHub
-                model_data = await load_asset_bytes(model_asset)
-                clothing_data = await load_asset_bytes(clothing_asset)
-
-                model_rh_name = await client.upload_image(model_data, model_asset.filename)
-                clothing_rh_name = await client.upload_image(clothing_data, clothing_asset.filename)
+                # Stream (local or external) images to RunningHub; the uploads are independent.
+                model_rh_name, clothing_rh_name = await _gather_or_cancel(
+                    upload_asset(model_asset),
+                    upload_asset(clothing_asset),
+                )
 
                 if not model_rh_name or not clothing_rh_name:
-                    task.status = TaskStatus.FAILED
-                    task.error_message = "Failed to upload images to RunningHub"
-                    task.completed_at = datetime.now(timezone.utc)
-                    await db.commit()
+                    await fail("Failed to upload images to RunningHub")
                     return
 
                 params = {
@@ -441,35 +659,27 @@ async def submit_and_poll_task(task_id: int, task_type: str):
                 }
 
             elif task_type == "background":
-                source_asset = await db.execute(
-                    select(Asset).where(Asset.id == task.input_params.get("source_image_id"))
-                )
-                source_asset = source_asset.scalar_one_or_none()
-                bg_asset = await db.execute(
-                    select(Asset).where(Asset.id == task.input_params.get("background_image_id"))
-                )
-                bg_asset = bg_asset.scalar_one_or_none()
+                source_id = task.input_params.get("source_image_id")
+                bg_id = task.input_params.get("background_image_id")
+                assets = await _get_assets_by_id(db, [source_id, bg_id])
+                source_asset = assets.get(source_id)
+                bg_asset = assets.get(bg_id)
 
                 if not source_asset:
-                    task.status = TaskStatus.FAILED
-                    task.error_message = "Source asset not found"
-                    task.completed_at = datetime.now(timezone.utc)
-                    await db.commit()
+                    await fail("Source asset not found")
                     return
 
-                source_data = await load_asset_bytes(source_asset)
-                source_rh_name = await client.upload_image(source_data, source_asset.filename)
-
-                bg_rh_name = None
                 if bg_asset:
-                    bg_data = await load_asset_bytes(bg_asset)
-                    bg_rh_name = await client.upload_image(bg_data, bg_asset.filename)
+                    source_rh_name, bg_rh_name = await _gather_or_cancel(
+                        upload_asset(source_asset),
+                        upload_asset(bg_asset),
+                    )
+                else:
+                    source_rh_name = await upload_asset(source_asset)
+                    bg_rh_name = None
 
                 if not source_rh_name:
-                    task.status = TaskStatus.FAILED
-                    task.error_message = "Failed to upload images to RunningHub"
-                    task.completed_at = datetime.now(timezone.utc)
-                    await db.commit()
+                    await fail("Failed to upload images to RunningHub")
                     return
 
                 params = {
@@ -478,33 +688,23 @@ async def submit_and_poll_task(task_id: int, task_type: str):
                 }
 
             elif task_type == "video":
-                person_asset = await db.execute(
-                    select(Asset).where(Asset.id == task.input_params.get("person_image_id"))
-                )
-                person_asset = person_asset.scalar_one_or_none()
-                ref_asset = await db.execute(
-                    select(Asset).where(Asset.id == task.input_params.get("reference_video_id"))
-                )
-                ref_asset = ref_asset.scalar_one_or_none()
+                person_id = task.input_params.get("person_image_id")
+                ref_id = task.input_params.get("reference_video_id")
+                assets = await _get_assets_by_id(db, [person_id, ref_id])
+                person_asset = assets.get(person_id)
+                ref_asset = assets.get(ref_id)
 
                 if not person_asset or not ref_asset:
-                    task.status = TaskStatus.FAILED
-                    task.error_message = "Required asset not found"
-                    task.completed_at = datetime.now(timezone.utc)
-                    await db.commit()
+                    await fail("Required asset not found")
                     return
 
-                person_data = await load_asset_bytes(person_asset)
-                ref_data = await load_asset_bytes(ref_asset)
-
-                person_rh_name = await client.upload_image(person_data, person_asset.filename)
-                ref_rh_name = await client.upload_file(ref_data, ref_asset.filename)
+                person_rh_name, ref_rh_name = await _gather_or_cancel(
+                    upload_asset(person_asset),
+                    upload_asset(ref_asset),
+                )
 
                 if not person_rh_name or not ref_rh_name:
-                    task.status = TaskStatus.FAILED
-                    task.error_message = "Failed to upload assets to RunningHub"
-                    task.completed_at = datetime.now(timezone.utc)
-                    await db.commit()
+                    await fail("Failed to upload assets to RunningHub")
                     return
 
                 params = {
@@ -521,10 +721,7 @@ async def submit_and_poll_task(task_id: int, task_type: str):
             response = await client.create_task(app_config, params)
 
             if not response.success:
-                task.status = TaskStatus.FAILED
-                task.error_message = response.error_message or "Task creation failed"
-                task.completed_at = datetime.now(timezone.utc)
-                await db.commit()
+                await fail(response.error_message or "Task creation failed")
                 return
 
             task.runninghub_task_id = response.task_id
@@ -532,16 +729,33 @@ async def submit_and_poll_task(task_id: int, task_type: str):
             task.status = TaskStatus.RUNNING
             await db.commit()
 
-            # Progress callback to update database
+            # Progress callback to update database. Polls arrive every few seconds; only
+            # write when progress moved noticeably or the last write is getting stale.
+            # The final state is always committed after wait_for_completion returns.
+            committed_progress = task.progress_percent or 0
+            committed_at = time.monotonic()
+
             async def update_progress(status_str: str, progress: int, elapsed: float):
-                task.progress_percent = progress
+                nonlocal committed_progress, committed_at
+                if progress == committed_progress:
+                    return
+                now = time.monotonic()
+                if progress - committed_progress < 5 and now - committed_at < 10.0:
+                    return
+                # One-column UPDATE instead of a unit-of-work flush; the default
+                # synchronize_session keeps the loaded task's value in step.
+                await db.execute(
+                    update(Task).where(Task.id == task.id).values(progress_percent=progress)
+                )
                 await db.commit()
-
-            # Poll for completion with progress updates
-            # Per-app configs encode the expected upper bound for that workflow. In dev it is
-            # easy to set MAX_TASK_TIMEOUT too low (e.g., 300s) which is fine for image tasks
-            # but too short for video. Use the larger of the two to avoid premature timeouts.
-            effective_timeout = int(max(settings.max_task_timeout, getattr(app_config, "timeout", 0) or 0))
+                committed_progress, committed_at = progress, now
+
+            # Poll for completion with progress updates. No connection is held while waiting:
+            # the session returns it to the pool on every commit (expire_on_commit=False, so
+            # reading the task afterwards does not reconnect) and only checks one out again
+            # for a progress tick or the terminal write.
+            # Per-app configs encode the expected upper bound for that workflow.
+            effective_timeout = step_timeout(app_config)
             status_response = await client.wait_for_completion(
                 response.task_id,
                 timeout=effective_timeout,
@@ -550,6 +764,9 @@ async def submit_and_poll_task(task_id: int, task_type: str):
 
             # Update task with results
             if status_response.status == "SUCCESS":
+                # Lock the row while finalizing; the webhook skips locked tasks, and if it
+                # already attached the result we must not create a second asset.
+                await db.refresh(task, attribute_names=["result_asset_id"], with_for_update=True)
                 task.status = TaskStatus.SUCCESS
                 task.result_url = status_response.result_url
                 task.progress_percent = 100
@@ -563,53 +780,10 @@ async def submit_and_poll_task(task_id: int, task_type: str):
                     task.third_party_cost = status_response.usage.third_party_consume_money
 
                 # Create Asset and update Project with result
-                if status_response.result_url:
-                    from app.models.asset import AssetType
-
-                    # Map task type to asset type
-                    asset_type_map = {
-                        "try_on": AssetType.TRY_ON_RESULT,
-                        "background": AssetType.BACKGROUND_RESULT,
-                        "video": AssetType.VIDEO_RESULT,
-                    }
-
-                    # Get project to find user_id
-                    project_result = await db.execute(
-                        select(Project).where(Project.id == task.project_id)
+                if status_response.result_url and not task.result_asset_id:
+                    await _attach_result_asset(
+                        db, task, task_type, status_response.result_url, status_response.outputs
                     )
-                    project = project_result.scalar_one_or_none()
-
-                    if project:
-                        # Use server *local* time for naming as requested.
-                        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        base = f"{_safe_filename_component(project.name)}_{task_type}_{ts}"
-                        ext = _guess_ext(status_response.result_url, task_type, outputs=status_response.outputs)
-                        display_name = f"{base}{ext}"
-
-                        # Create new asset for the result
-                        result_asset = Asset(
-                            user_id=project.user_id,
-                            filename=display_name,
-                            display_name=display_name,
-                            original_filename=display_name,
-                            file_path=status_response.result_url,  # Store external URL
-                            file_url=status_response.result_url,   # Use external URL directly
-                            asset_type=asset_type_map.get(task_type, AssetType.TRY_ON_RESULT),
-                            mime_type=_mime_from_ext(ext),
-                            file_size=0,  # Unknown for external URL
-                        )
-                        db.add(result_asset)
-                        await db.flush()
-
-                        task.result_asset_id = result_asset.id
-
-                        # Update project with result reference
-                        if task_type == "try_on":
-                            project.try_on_result_id = result_asset.id
-                        elif task_type == "background":
-                            project.background_result_id = result_asset.id
-                        elif task_type == "video":
-                            project.video_result_id = result_asset.id
 
             else:
                 task.status = TaskStatus.FAILED
@@ -619,17 +793,18 @@ async def submit_and_poll_task(task_id: int, task_type: str):
             await db.commit()
 
         except TimeoutError:
-            task.status = TaskStatus.FAILED
             effective_timeout = int(locals().get("effective_timeout", settings.max_task_timeout))
-            task.error_message = f"Timeout failed ({_format_duration(effective_timeout)})"
-            task.completed_at = datetime.now(timezone.utc)
-            await db.commit()
+            await db.rollback()
+            await fail(f"Timeout failed ({_format_duration(effective_timeout)})")
 
         except Exception as e:
-            task.status = TaskStatus.FAILED
-            task.error_message = str(e)
-            task.completed_at = datetime.now(timezone.utc)
-            await db.commit()
+            # The session may be mid-transaction in a failed state; start clean so the
+            # FAILED state can actually be written.
+            await db.rollback()
+            await fail(str(e))
+
+        finally:
+            await client.aclose()
 
 
 @router.post("/webhook/runninghub")
@@ -638,19 +813,27 @@ async def runninghub_webhook(
     db: DbSession,
 ):
     """Handle RunningHub webhook callbacks."""
-    data = await request.json()
+    data = orjson.loads(await request.body())
 
     task_id = data.get("taskId")
     if not task_id:
         return {"status": "ignored", "reason": "no task_id"}
 
+    # SKIP LOCKED: a row locked here is being finalized by the poller (or a duplicate
+    # delivery of this callback), which will write the same outcome.
     result = await db.execute(
-        select(Task).where(Task.runninghub_task_id == task_id)
+        select(Task)
+        .where(Task.runninghub_task_id == task_id)
+        .with_for_update(skip_locked=True)
     )
     task = result.scalar_one_or_none()
 
     if task is None:
-        return {"status": "ignored", "reason": "task not found"}
+        return {"status": "ignored", "reason": "task not found or busy"}
+
+    # Already finalized (usually by the poller): nothing left to do.
+    if task.status == TaskStatus.SUCCESS and task.result_asset_id:
+        return {"status": "ok"}
 
     # Update task based on webhook data
     status_str = data.get("status", "").upper()
@@ -664,44 +847,7 @@ async def runninghub_webhook(
 
         # If we don't have a result asset yet, create one for retention/history/download naming.
         if task.result_url and not task.result_asset_id:
-            from app.models.asset import AssetType
-            from sqlalchemy import select as _select
-
-            project_result = await db.execute(_select(Project).where(Project.id == task.project_id))
-            project = project_result.scalar_one_or_none()
-            if project:
-                ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                task_type_value = task.task_type.value
-                base = f"{_safe_filename_component(project.name)}_{task_type_value}_{ts}"
-                ext = _guess_ext(task.result_url, task_type_value, outputs=outputs)
-                display_name = f"{base}{ext}"
-
-                asset_type_map = {
-                    "try_on": AssetType.TRY_ON_RESULT,
-                    "background": AssetType.BACKGROUND_RESULT,
-                    "video": AssetType.VIDEO_RESULT,
-                }
-                result_asset = Asset(
-                    user_id=project.user_id,
-                    filename=display_name,
-                    display_name=display_name,
-                    original_filename=display_name,
-                    file_path=task.result_url,
-                    file_url=task.result_url,
-                    asset_type=asset_type_map.get(task_type_value, AssetType.TRY_ON_RESULT),
-                    mime_type=_mime_from_ext(ext),
-                    file_size=0,
-                )
-                db.add(result_asset)
-                await db.flush()
-
-                task.result_asset_id = result_asset.id
-                if task_type_value == "try_on":
-                    project.try_on_result_id = result_asset.id
-                elif task_type_value == "background":
-                    project.background_result_id = result_asset.id
-                elif task_type_value == "video":
-                    project.video_result_id = result_asset.id
+            await _attach_result_asset(db, task, task.task_type.value, task.result_url, outputs)
 
         # Extract usage data
         if "usage" in data:
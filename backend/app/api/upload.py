@@ -1,55 +1,80 @@
 """File upload API routes."""
-import hashlib
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form
+from sqlalchemy import delete, select
 
-from fastapi import APIRouter, HTTPException, status, UploadFile, File, Form, Request
-
-from app.api.deps import DbSession, CurrentUser
+from app.api.deps import DbSession, CurrentUser, UserTokenBucketLimiter
 from app.config import get_settings
 from app.models.asset import Asset, AssetType
 from app.schemas.asset import AssetResponse, AssetUploadResponse
-from app.utils.storage import storage
-from app.utils.rate_limiter import limiter
+from app.utils.storage import FileTooLargeError, storage
 
 settings = get_settings()
 router = APIRouter()
 
 
+def _upload_response(asset: Asset, reused: bool = False) -> AssetUploadResponse:
+    return AssetUploadResponse(
+        id=asset.id,
+        file_url=asset.file_url,
+        content_hash=asset.content_hash,
+        original_filename=asset.original_filename,
+        asset_type=asset.asset_type,
+        display_name=asset.display_name,
+        reused=reused,
+    )
+
+
+async def _find_duplicate(db, user_id: int, content_hash: str, asset_type: AssetType) -> Asset | None:
+    """Return the user's existing asset with the same bytes and type, if any.
+
+    Uploads reuse it instead of storing a second copy (ix_assets_user_content_hash).
+    """
+    result = await db.execute(
+        select(Asset)
+        .where(
+            Asset.user_id == user_id,
+            Asset.content_hash == content_hash,
+            Asset.asset_type == asset_type,
+        )
+        .order_by(Asset.id)
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
 def validate_image(file: UploadFile) -> None:
     """Validate uploaded image file."""
-    if file.content_type not in settings.allowed_image_types_list:
+    if file.content_type not in settings.allowed_image_types_set:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid file type. Allowed: {', '.join(settings.allowed_image_types_list)}",
         )
 
 
-def validate_video(file: UploadFile) -> None:
-    """Validate uploaded video file."""
-    if file.content_type in settings.allowed_video_types_list:
-        return
-
-    # Some browsers send "application/octet-stream" for MP4 files.
-    if file.content_type == "application/octet-stream":
-        return
+# Some browsers send "application/octet-stream" for MP4 files.
+_VIDEO_CONTENT_TYPES_OK = settings.allowed_video_types_set | {"application/octet-stream"}
 
-    filename = (file.filename or "").lower()
-    if filename.endswith(".mp4"):
-        return
 
-    if file.content_type and file.content_type.startswith("video/"):
+def validate_video(file: UploadFile) -> None:
+    """Validate uploaded video file."""
+    content_type = file.content_type or ""
+    if content_type in _VIDEO_CONTENT_TYPES_OK or content_type.startswith("video/"):
         return
 
-    if file.content_type not in settings.allowed_video_types_list:
+    if not (file.filename or "").lower().endswith(".mp4"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid file type. Allowed: {', '.join(settings.allowed_video_types_list)}",
         )
 
 
-@router.post("/image", response_model=AssetUploadResponse, status_code=status.HTTP_201_CREATED)
-@limiter.limit("30/minute")
+@router.post(
+    "/image",
+    response_model=AssetUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(UserTokenBucketLimiter(capacity=30, refill_per_sec=30 / 60))],
+)
 async def upload_image(
-    request: Request,
     current_user: CurrentUser,
     db: DbSession,
     file: UploadFile = File(...),
@@ -59,54 +84,56 @@ async def upload_image(
     # Validate file type
     validate_image(file)
 
-    # Read file content
-    content = await file.read()
-    content_hash = hashlib.sha256(content).hexdigest()
-
-    # Check file size
-    if len(content) > settings.max_upload_size:
+    # Stream to a partial file, hashing as we go; oversized files are rejected at the limit
+    # without buffering the whole body.
+    try:
+        staged = await storage.stage_upload(
+            file,
+            original_filename=file.filename or "image.jpg",
+            subfolder="images",
+            max_size=settings.max_upload_size,
+        )
+    except FileTooLargeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File too large. Maximum size: {settings.max_upload_size // 1024 // 1024}MB",
         )
 
-    # Save file
-    relative_path, filename = await storage.save_file(
-        content=content,
-        original_filename=file.filename or "image.jpg",
-        subfolder="images",
-    )
+    try:
+        # Same bytes already stored: hand back that asset (flagged as reused, it keeps its
+        # own name) and never move the new copy into place.
+        existing = await _find_duplicate(db, current_user.id, staged.content_hash, asset_type)
+        if existing is not None:
+            return _upload_response(existing, reused=True)
+        storage.commit_upload(staged)
+    finally:
+        storage.discard_upload(staged)
 
     # Create asset record
     asset = Asset(
         user_id=current_user.id,
-        filename=filename,
+        filename=staged.filename,
         original_filename=file.filename or "image.jpg",
-        file_path=relative_path,
-        file_url=storage.get_file_url(relative_path),
-        content_hash=content_hash,
+        file_path=staged.relative_path,
+        file_url=storage.get_file_url(staged.relative_path),
+        content_hash=staged.content_hash,
         asset_type=asset_type,
         mime_type=file.content_type or "image/jpeg",
-        file_size=len(content),
+        file_size=staged.size,
     )
     db.add(asset)
     await db.flush()
-    await db.refresh(asset)
 
-    return AssetUploadResponse(
-        id=asset.id,
-        file_url=asset.file_url,
-        content_hash=asset.content_hash,
-        original_filename=asset.original_filename,
-        asset_type=asset.asset_type,
-        display_name=asset.display_name,
-    )
+    return _upload_response(asset)
 
 
-@router.post("/video", response_model=AssetUploadResponse, status_code=status.HTTP_201_CREATED)
-@limiter.limit("10/minute")
+@router.post(
+    "/video",
+    response_model=AssetUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(UserTokenBucketLimiter(capacity=10, refill_per_sec=10 / 60))],
+)
 async def upload_video(
-    request: Request,
     current_user: CurrentUser,
     db: DbSession,
     file: UploadFile = File(...),
@@ -122,48 +149,47 @@ async def upload_video(
     # Validate file type
     validate_video(file)
 
-    # Read file content
-    content = await file.read()
-    content_hash = hashlib.sha256(content).hexdigest()
-
-    # Check file size
-    if len(content) > settings.max_video_upload_size:
+    # Stream to a partial file, hashing as we go; oversized files are rejected at the limit
+    # without buffering the whole body.
+    try:
+        staged = await storage.stage_upload(
+            file,
+            original_filename=file.filename or "video.mp4",
+            subfolder="videos",
+            max_size=settings.max_video_upload_size,
+        )
+    except FileTooLargeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File too large. Maximum size: {settings.max_video_upload_size // 1024 // 1024}MB",
         )
 
-    # Save file
-    relative_path, filename = await storage.save_file(
-        content=content,
-        original_filename=file.filename or "video.mp4",
-        subfolder="videos",
-    )
+    try:
+        # Same bytes already stored: hand back that asset (flagged as reused, it keeps its
+        # own name) and never move the new copy into place.
+        existing = await _find_duplicate(db, current_user.id, staged.content_hash, asset_type)
+        if existing is not None:
+            return _upload_response(existing, reused=True)
+        storage.commit_upload(staged)
+    finally:
+        storage.discard_upload(staged)
 
     # Create asset record
     asset = Asset(
         user_id=current_user.id,
-        filename=filename,
+        filename=staged.filename,
         original_filename=file.filename or "video.mp4",
-        file_path=relative_path,
-        file_url=storage.get_file_url(relative_path),
-        content_hash=content_hash,
+        file_path=staged.relative_path,
+        file_url=storage.get_file_url(staged.relative_path),
+        content_hash=staged.content_hash,
         asset_type=asset_type,
         mime_type=file.content_type or "video/mp4",
-        file_size=len(content),
+        file_size=staged.size,
     )
     db.add(asset)
     await db.flush()
-    await db.refresh(asset)
 
-    return AssetUploadResponse(
-        id=asset.id,
-        file_url=asset.file_url,
-        content_hash=asset.content_hash,
-        original_filename=asset.original_filename,
-        asset_type=asset.asset_type,
-        display_name=asset.display_name,
-    )
+    return _upload_response(asset)
 
 
 @router.get("/{asset_id}", response_model=AssetResponse)
@@ -173,8 +199,6 @@ async def get_asset(
     db: DbSession,
 ):
     """Get asset details."""
-    from sqlalchemy import select
-
     result = await db.execute(
         select(Asset).where(Asset.id == asset_id, Asset.user_id == current_user.id)
     )
@@ -194,24 +218,24 @@ async def delete_asset(
     asset_id: int,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
 ):
     """Delete an asset."""
-    from sqlalchemy import select
-
+    # One round-trip; referencing project/task columns are nulled by their FKs (SET NULL).
     result = await db.execute(
-        select(Asset).where(Asset.id == asset_id, Asset.user_id == current_user.id)
+        delete(Asset)
+        .where(Asset.id == asset_id, Asset.user_id == current_user.id)
+        .returning(Asset.file_path)
     )
-    asset = result.scalar_one_or_none()
+    file_path = result.scalar_one_or_none()
 
-    if asset is None:
+    if file_path is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Asset not found",
         )
 
-    # Delete local file from storage (result assets may be externally hosted).
-    if not (asset.file_path.startswith("http://") or asset.file_path.startswith("https://")):
-        await storage.delete_file(asset.file_path)
-
-    # Delete database record
-    await db.delete(asset)
+    # Delete local file from storage (result assets may be externally hosted). The file is
+    # removed after the response is sent; the client only waits for the row.
+    if not (file_path.startswith("http://") or file_path.startswith("https://")):
+        background_tasks.add_task(storage.delete_file, file_path)
@@ -3,6 +3,7 @@ from fastapi import APIRouter, HTTPException, status
 
 from app.api.deps import DbSession, CurrentUser
 from app.schemas.user import UserResponse, UserUpdate
+from app.services.user_cache import invalidate_user
 
 router = APIRouter()
 
@@ -25,8 +26,11 @@ async def update_profile(
     if update_data.avatar_url is not None:
         current_user.avatar_url = update_data.avatar_url
 
-    await db.flush()
+    # Commit before dropping the cached copy: until then a concurrent request would read
+    # the old row and cache it again.
+    await db.commit()
     await db.refresh(current_user)
+    await invalidate_user(current_user.id)
     return current_user
 
 
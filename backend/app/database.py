@@ -5,18 +5,39 @@ import asyncio
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import get_settings
 
 settings = get_settings()
 
 # Create async engine
+# Some handlers (e.g. start_pipeline) check out a second connection for concurrent
+# queries, so size pool_size + max_overflow for ~2 connections per in-flight request.
+_connect_args: dict = {}
+if settings.database_url.startswith("postgresql+asyncpg"):
+    _connect_args = {
+        "statement_cache_size": settings.db_statement_cache_size,
+        # SQLAlchemy's asyncpg adapter prepares statements through its own per-connection
+        # LRU (default 100) before asyncpg's cache sees them; size both the same.
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+        # JIT compilation only pays off for long analytic queries; for short OLTP
+        # queries its planning overhead dominates.
+        "server_settings": {"jit": "off"},
+    }
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
+    poolclass=AsyncAdaptedQueuePool,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    # Reuse the most recently returned connection so bursts hit connections whose
+    # statement caches are warm, and idle extras age out via pool_recycle.
+    pool_use_lifo=True,
+    connect_args=_connect_args,
 )
 
 # Create async session factory
@@ -1,18 +1,18 @@
 """FastAPI application entry point."""
+import os
+import stat
 from contextlib import asynccontextmanager
 from pathlib import Path
+from urllib.parse import quote
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 
 from app.api import api_router
 from app.config import get_settings
 from app.database import init_db
-from app.utils.rate_limiter import limiter
 
 settings = get_settings()
 
@@ -38,14 +38,12 @@ app = FastAPI(
     description="E-commerce Model AI Processing Platform",
     version="1.0.0",
     lifespan=lifespan,
+    # Render response_model output with orjson instead of the stdlib encoder.
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
 )
 
-# Add rate limiter
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -60,33 +58,54 @@ app.include_router(api_router, prefix=settings.api_prefix)
 
 
 # Static file serving for uploads
+# Resolved once: the per-request check only has to resolve the requested path.
+_UPLOAD_ROOT = Path(settings.upload_dir).resolve()
+_UPLOAD_ROOT_STR = str(_UPLOAD_ROOT)
+
+
 @app.get("/api/files/{file_path:path}")
 async def serve_file(file_path: str):
     """Serve uploaded files."""
-    full_path = Path(settings.upload_dir) / file_path
+    full_path = (_UPLOAD_ROOT / file_path).resolve()
+
+    # Security check: prevent path traversal (before touching the file at all)
+    try:
+        inside = os.path.commonpath([_UPLOAD_ROOT_STR, full_path]) == _UPLOAD_ROOT_STR
+    except ValueError:  # e.g. different drives on Windows
+        inside = False
+    if not inside:
+        return JSONResponse(
+            status_code=403,
+            content={"detail": "Access denied"},
+        )
 
-    if not full_path.exists():
+    # One stat() answers both "exists" and "is a regular file". Unreadable paths
+    # (PermissionError etc.) are reported as missing, as the old exists() check did.
+    try:
+        st = full_path.stat()
+    except OSError:
         return JSONResponse(
             status_code=404,
             content={"detail": "File not found"},
         )
 
-    if not full_path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return JSONResponse(
             status_code=400,
             content={"detail": "Invalid file path"},
         )
 
-    # Security check: prevent path traversal
-    try:
-        full_path.resolve().relative_to(Path(settings.upload_dir).resolve())
-    except ValueError:
-        return JSONResponse(
-            status_code=403,
-            content={"detail": "Access denied"},
+    if settings.files_accel_redirect_prefix:
+        # Zero-copy: the proxy serves the file from disk; only headers pass through Python.
+        # Hand over the path that passed the containment check, not the raw request path.
+        accel_path = quote(full_path.relative_to(_UPLOAD_ROOT).as_posix())
+        return Response(
+            headers={
+                "X-Accel-Redirect": f"{settings.files_accel_redirect_prefix.rstrip('/')}/{accel_path}",
+            },
         )
 
-    return FileResponse(full_path)
+    return FileResponse(full_path, stat_result=st)
 
 
 # Health check endpoint
@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -27,6 +27,8 @@ class Asset(Base):
     """Asset model for file storage."""
 
     __tablename__ = "assets"
+    # Return created_at via INSERT ... RETURNING so handlers don't refresh() after flush().
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
@@ -58,3 +60,9 @@ class Asset(Base):
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="assets")
+
+
+# Result retention cleanup / recent-results cutoffs.
+Index("ix_assets_created_at", Asset.created_at.desc())
+# Upload dedupe: WHERE user_id = ? AND content_hash = ? (created in 20260130_000004).
+Index("ix_assets_user_content_hash", Asset.user_id, Asset.content_hash)
@@ -3,7 +3,8 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Integer, String, Text, func
+from sqlalchemy import JSON, DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -26,6 +27,9 @@ class Project(Base):
     """Project model for organizing workflow."""
 
     __tablename__ = "projects"
+    # Fetch server-generated values (created_at/updated_at) via RETURNING on INSERT and
+    # UPDATE, so handlers don't need a refresh() round-trip after flush().
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
@@ -45,8 +49,11 @@ class Project(Base):
     enable_background: Mapped[bool] = mapped_column(default=True)
     enable_video: Mapped[bool] = mapped_column(default=True)
 
-    # Workflow order (JSON text list: ["try_on","background","video"])
-    workflow_steps: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Workflow order (JSON list: ["try_on","background","video"]); JSONB on Postgres.
+    workflow_steps: Mapped[list[str] | None] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=True,
+    )
 
     # Per-step input sources
     # background_person_source:
@@ -120,36 +127,49 @@ class Project(Base):
     tasks: Mapped[list["Task"]] = relationship(
         "Task",
         back_populates="project",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        # tasks.project_id is ON DELETE CASCADE; let the database remove them instead of
+        # loading every task just to delete it.
+        passive_deletes=True,
     )
 
+    # Asset references are only read by response serialization, and every query that
+    # returns a project eager-loads them. An accidental lazy load (which would also fail
+    # under asyncio) raises instead of silently adding a round trip.
     model_image: Mapped["Asset | None"] = relationship(
         "Asset",
-        foreign_keys=[model_image_id]
+        foreign_keys=[model_image_id],
+        lazy="raise_on_sql",
     )
     clothing_image: Mapped["Asset | None"] = relationship(
         "Asset",
-        foreign_keys=[clothing_image_id]
+        foreign_keys=[clothing_image_id],
+        lazy="raise_on_sql",
     )
     background_image: Mapped["Asset | None"] = relationship(
         "Asset",
         foreign_keys=[background_image_id],
+        lazy="raise_on_sql",
     )
     reference_video: Mapped["Asset | None"] = relationship(
         "Asset",
         foreign_keys=[reference_video_id],
+        lazy="raise_on_sql",
     )
     try_on_result: Mapped["Asset | None"] = relationship(
         "Asset",
-        foreign_keys=[try_on_result_id]
+        foreign_keys=[try_on_result_id],
+        lazy="raise_on_sql",
     )
     background_result: Mapped["Asset | None"] = relationship(
         "Asset",
-        foreign_keys=[background_result_id]
+        foreign_keys=[background_result_id],
+        lazy="raise_on_sql",
     )
     video_result: Mapped["Asset | None"] = relationship(
         "Asset",
-        foreign_keys=[video_result_id]
+        foreign_keys=[video_result_id],
+        lazy="raise_on_sql",
     )
 
     # Pipeline runtime state (for sequential execution).
@@ -161,3 +181,7 @@ class Project(Base):
     pipeline_last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
     pipeline_started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     pipeline_updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+# list_projects: WHERE user_id = ? ORDER BY updated_at DESC
+Index("ix_projects_user_updated", Project.user_id, Project.updated_at.desc())
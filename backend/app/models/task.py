@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, Enum as SQLEnum, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, Enum as SQLEnum, Float, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -34,13 +34,14 @@ class Task(Base):
     """Task model for tracking AI processing jobs."""
 
     __tablename__ = "tasks"
+    # Return created_at via INSERT ... RETURNING so services don't refresh() after flush().
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     project_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("projects.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
     )
     task_type: Mapped[TaskType] = mapped_column(SQLEnum(TaskType), nullable=False)
     status: Mapped[TaskStatus] = mapped_column(
@@ -82,5 +83,32 @@ class Task(Base):
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    project: Mapped["Project"] = relationship("Project", back_populates="tasks")
-    result_asset: Mapped["Asset | None"] = relationship("Asset", foreign_keys=[result_asset_id])
+    # Nothing traverses these (TaskResponse is flat and ownership is checked with a join),
+    # so a lazy load would be a hidden extra query; raise instead.
+    project: Mapped["Project"] = relationship(
+        "Project",
+        back_populates="tasks",
+        lazy="raise_on_sql",
+    )
+    result_asset: Mapped["Asset | None"] = relationship(
+        "Asset",
+        foreign_keys=[result_asset_id],
+        lazy="raise_on_sql",
+    )
+
+
+# get_project_tasks: WHERE project_id = ? ORDER BY created_at DESC (also covers project_id).
+Index("ix_tasks_project_created", Task.project_id, Task.created_at.desc())
+# Partial indexes (Postgres) for the active-task check and project result listing.
+Index(
+    "ix_tasks_project_active",
+    Task.project_id,
+    postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+)
+Index(
+    "ix_tasks_project_success_result",
+    Task.project_id,
+    Task.task_type,
+    Task.result_asset_id,
+    postgresql_where=text("status = 'SUCCESS'"),
+)
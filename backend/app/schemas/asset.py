@@ -30,5 +30,7 @@ class AssetUploadResponse(BaseModel):
     original_filename: str
     asset_type: AssetType
     display_name: str | None = None
+    # True when the same bytes were already uploaded and that asset is returned instead.
+    reused: bool = False
 
     model_config = {"from_attributes": True}
@@ -1,6 +1,5 @@
 """Project schemas for request/response validation."""
 from datetime import datetime
-import json
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -99,20 +98,8 @@ class ProjectResponse(BaseModel):
     @field_validator("workflow_steps", mode="before")
     @classmethod
     def _parse_workflow_steps(cls, v):
-        if v is None:
-            return None
-        if isinstance(v, list):
-            return v
-        if isinstance(v, str):
-            s = v.strip()
-            if not s:
-                return None
-            try:
-                parsed = json.loads(s)
-                return parsed if isinstance(parsed, list) else None
-            except Exception:
-                return None
-        return None
+        # The column is JSON/JSONB, so the driver already hands us a decoded list.
+        return v if isinstance(v, list) else None
 
 
 class ProjectListResponse(BaseModel):
@@ -56,7 +56,6 @@ class BackgroundService:
         )
         self.db.add(task)
         await self.db.flush()
-        await self.db.refresh(task)
 
         return task
 
@@ -0,0 +1,34 @@
+"""Short-lived Redis cache for serialized JSON responses of polled list endpoints.
+
+Entries live for a couple of seconds: enough to absorb several clients polling the same
+list, short enough that staleness is invisible next to the polling interval. Redis
+errors fall through to the database path.
+"""
+from redis.exceptions import RedisError
+
+from app.utils.redis_client import get_redis
+
+
+async def get_cached_body(key: str) -> bytes | None:
+    """Return the cached JSON body for `key`, or None on miss."""
+    try:
+        raw = await get_redis().get(key)
+    except RedisError:
+        return None
+    return raw.encode() if raw else None
+
+
+async def cache_body(key: str, body: bytes, ttl: int) -> None:
+    """Store a JSON body for `ttl` seconds."""
+    try:
+        await get_redis().setex(key, ttl, body.decode())
+    except RedisError:
+        pass
+
+
+async def invalidate_body(key: str) -> None:
+    """Drop a cached body so the next request rebuilds it."""
+    try:
+        await get_redis().delete(key)
+    except RedisError:
+        pass
@@ -1,6 +1,6 @@
 """RunningHub API integration."""
 from app.services.runninghub.client import RunningHubClient
-from app.services.runninghub.apps import AppConfig, get_app_config
+from app.services.runninghub.apps import AppConfig, get_app_config, step_timeout
 from app.services.runninghub.models import (
     TaskCreateResponse,
     TaskStatusResponse,
@@ -11,6 +11,7 @@ __all__ = [
     "RunningHubClient",
     "AppConfig",
     "get_app_config",
+    "step_timeout",
     "TaskCreateResponse",
     "TaskStatusResponse",
     "TaskUsage",
@@ -75,19 +75,30 @@ VIDEO_CONFIG = AppConfig(
 )
 
 
+_APP_CONFIGS = {
+    "try_on": TRY_ON_CONFIG,
+    "background": BACKGROUND_CONFIG,
+    "video": VIDEO_CONFIG,
+}
+
+
 def get_app_config(task_type: str) -> AppConfig:
     """Get application config by task type."""
-    configs = {
-        "try_on": TRY_ON_CONFIG,
-        "background": BACKGROUND_CONFIG,
-        "video": VIDEO_CONFIG,
-    }
-    config = configs.get(task_type)
+    config = _APP_CONFIGS.get(task_type)
     if config is None:
         raise ValueError(f"Unknown task type: {task_type}")
     return config
 
 
+def step_timeout(config: AppConfig) -> int:
+    """Polling timeout for one workflow step.
+
+    In dev it is easy to set MAX_TASK_TIMEOUT too low (e.g., 300s) which is fine for image
+    tasks but too short for video, so the app's own bound wins when it is larger.
+    """
+    return max(settings.max_task_timeout, config.timeout)
+
+
 def build_node_inputs(
     config: AppConfig,
     params: dict[str, Any]
@@ -1,9 +1,12 @@
 """RunningHub API client."""
 import asyncio
+import os
 import uuid
+from collections.abc import AsyncIterator
 from typing import Any, Callable
 
 import httpx
+from aiofiles.threadpool.binary import AsyncBufferedIOBase, AsyncBufferedReader
 
 from app.config import get_settings
 from app.services.runninghub.apps import AppConfig, build_node_inputs
@@ -11,6 +14,50 @@ from app.services.runninghub.models import TaskCreateResponse, TaskStatusRespons
 
 settings = get_settings()
 
+_UPLOAD_MIME_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "mp4": "video/mp4",
+}
+
+_UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+def _multipart_file_body(
+    fields: dict[str, str], filename: str, mime_type: str, fileobj: AsyncBufferedReader
+) -> tuple[dict[str, str], AsyncIterator[bytes]]:
+    """Encode a multipart/form-data body whose file part is read asynchronously.
+
+    httpx only reads file parts synchronously, which would block the event loop on
+    every chunk of a large upload. Returns (headers, body); the length is declared
+    up front so the request is not sent chunked.
+    """
+    boundary = uuid.uuid4().hex
+    quoted = filename.replace("\\", "\\\\").replace('"', "%22")
+    head = b"".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items()
+    ) + (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{quoted}"\r\n'
+        f"Content-Type: {mime_type}\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+    size = os.fstat(fileobj.fileno()).st_size
+
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        while chunk := await fileobj.read(_UPLOAD_CHUNK_SIZE):
+            yield chunk
+        yield tail
+
+    headers = {
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+        "Content-Length": str(len(head) + size + len(tail)),
+    }
+    return headers, body()
+
 
 class RunningHubClient:
     """Client for RunningHub API interactions."""
@@ -19,6 +66,27 @@ class RunningHubClient:
         self.api_key = api_key or settings.runninghub_api_key
         self.base_url = base_url or settings.runninghub_base_url
         self.timeout = httpx.Timeout(30.0, read=120.0)
+        self._http: httpx.AsyncClient | None = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client shared by all calls on this instance."""
+        # Status polling runs every few seconds; reusing connections avoids a new
+        # TCP/TLS handshake per request.
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=self.timeout)
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def __aenter__(self) -> "RunningHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
     def _get_headers(self) -> dict[str, str]:
         """Get request headers with Bearer token authentication."""
@@ -58,14 +126,14 @@ class RunningHubClient:
             "usePersonalQueue": "false",
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/openapi/v2/run/ai-app/{app_config.app_id}",
-                headers=self._get_headers(),
-                json=payload,
-            )
-            response.raise_for_status()
-            return TaskCreateResponse(**response.json())
+        client = self._get_http()
+        response = await client.post(
+            f"{self.base_url}/openapi/v2/run/ai-app/{app_config.app_id}",
+            headers=self._get_headers(),
+            json=payload,
+        )
+        response.raise_for_status()
+        return TaskCreateResponse(**response.json())
 
     async def get_task_status(self, task_id: str) -> TaskStatusResponse:
         """
@@ -84,14 +152,14 @@ class RunningHubClient:
             "taskId": task_id,
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/task/openapi/outputs",
-                headers=self._get_headers(),
-                json=payload,
-            )
-            response.raise_for_status()
-            return TaskStatusResponse(**response.json())
+        client = self._get_http()
+        response = await client.post(
+            f"{self.base_url}/task/openapi/outputs",
+            headers=self._get_headers(),
+            json=payload,
+        )
+        response.raise_for_status()
+        return TaskStatusResponse(**response.json())
 
     async def cancel_task(self, task_id: str) -> bool:
         """
@@ -108,56 +176,70 @@ class RunningHubClient:
             "taskId": task_id,
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/openapi/v2/task/cancel",
-                headers=self._get_headers(),
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("code") == 0
-
-    async def upload_file(self, file_data: bytes, filename: str) -> str | None:
+        client = self._get_http()
+        response = await client.post(
+            f"{self.base_url}/openapi/v2/task/cancel",
+            headers=self._get_headers(),
+            json=payload,
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data.get("code") == 0
+
+    async def upload_file(self, file_data: bytes | AsyncBufferedReader, filename: str) -> str | None:
         """
         Upload a file (image/video) to RunningHub.
 
         API Endpoint: POST /task/openapi/upload
 
         Args:
-            file_data: File bytes
+            file_data: File bytes, or an aiofiles binary file (streamed in chunks)
             filename: Original filename
 
         Returns:
             fileName of uploaded file if successful (e.g., "api/xxxx.png")
         """
         # Determine mime type from filename
-        suffix = filename.lower().split(".")[-1] if "." in filename else "bin"
-        mime_types = {
-            "png": "image/png",
-            "jpg": "image/jpeg",
-            "jpeg": "image/jpeg",
-            "webp": "image/webp",
-            "mp4": "video/mp4",
-        }
-        mime_type = mime_types.get(suffix, "application/octet-stream")
+        suffix = filename.lower().rpartition(".")[2] if "." in filename else "bin"
+        mime_type = _UPLOAD_MIME_TYPES.get(suffix, "application/octet-stream")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            files = {"file": (filename, file_data, mime_type)}
-            data = {"apiKey": self.api_key}
+        client = self._get_http()
+        data = {"apiKey": self.api_key}
+        if isinstance(file_data, AsyncBufferedReader):
+            headers, body = _multipart_file_body(data, filename, mime_type, file_data)
+            response = await client.post(
+                f"{self.base_url}/task/openapi/upload",
+                content=body,
+                headers=headers,
+            )
+        else:
             response = await client.post(
                 f"{self.base_url}/task/openapi/upload",
                 data=data,
-                files=files,
+                files={"file": (filename, file_data, mime_type)},
             )
+        response.raise_for_status()
+        result = response.json()
+        if result.get("code") == 0:
+            # Returns fileName like "api/xxxx.png"
+            return result.get("data", {}).get("fileName")
+        return None
+
+    async def download_to(self, url: str, fileobj: AsyncBufferedIOBase) -> None:
+        """
+        Stream a (result) file into `fileobj` over the pooled client.
+
+        Args:
+            url: File URL, typically a RunningHub output
+            fileobj: Writable aiofiles binary file
+        """
+        client = self._get_http()
+        async with client.stream("GET", url, timeout=httpx.Timeout(30.0, read=300.0)) as response:
             response.raise_for_status()
-            result = response.json()
-            if result.get("code") == 0:
-                # Returns fileName like "api/xxxx.png"
-                return result.get("data", {}).get("fileName")
-            return None
+            async for chunk in response.aiter_bytes(64 * 1024):
+                await fileobj.write(chunk)
 
-    async def upload_image(self, image_data: bytes, filename: str) -> str | None:
+    async def upload_image(self, image_data: bytes | AsyncBufferedReader, filename: str) -> str | None:
         """Upload image to RunningHub (compat wrapper)."""
         return await self.upload_file(image_data, filename)
 
@@ -48,7 +48,6 @@ class TryOnService:
         )
         self.db.add(task)
         await self.db.flush()
-        await self.db.refresh(task)
 
         return task
 
@@ -1,6 +1,8 @@
 """Usage tracking and quota management service."""
+import json
 from datetime import date
 
+from redis.exceptions import RedisError
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,10 +10,15 @@ from app.config import get_settings
 from app.models.task import Task, TaskStatus
 from app.models.usage_stats import UsageStats, SystemConfig
 from app.models.user import User
+from app.utils.redis_client import get_redis
 
 settings = get_settings()
 
 
+def _daily_totals_key(user_id: int, target_date: date) -> str:
+    return f"quota:{user_id}:{target_date:%Y%m%d}"
+
+
 class UsageService:
     """Service for tracking usage and managing quotas."""
 
@@ -49,7 +56,11 @@ class UsageService:
         return stats
 
     async def record_task_usage(self, task: Task, user_id: int) -> None:
-        """Record task usage after completion."""
+        """Record task usage after completion.
+
+        The caller commits, then calls `invalidate_daily_totals`; dropping the cached
+        totals any earlier lets a concurrent quota check re-cache the old numbers.
+        """
         if task.status != TaskStatus.SUCCESS:
             return
 
@@ -70,6 +81,35 @@ class UsageService:
 
         await self.db.flush()
 
+    async def invalidate_daily_totals(self, user_id: int, target_date: date | None = None) -> None:
+        """Drop the cached daily totals (after the usage_stats change is committed)."""
+        try:
+            await get_redis().delete(_daily_totals_key(user_id, target_date or date.today()))
+        except RedisError:
+            pass
+
+    async def _get_daily_totals(self, user_id: int) -> tuple[int, float]:
+        """Today's (total_tasks, total_consume_money), cached in Redis.
+
+        usage_stats stays the source of truth; invalidate_daily_totals drops the cached copy.
+        """
+        key = _daily_totals_key(user_id, date.today())
+        try:
+            raw = await get_redis().get(key)
+        except RedisError:
+            raw = None
+        if raw:
+            total_tasks, total_money = json.loads(raw)
+            return total_tasks, total_money
+
+        stats = await self.get_user_daily_stats(user_id)
+        totals = (stats.total_tasks, stats.total_consume_money) if stats else (0, 0.0)
+        try:
+            await get_redis().setex(key, settings.quota_cache_ttl, json.dumps(totals))
+        except RedisError:
+            pass
+        return totals
+
     async def check_user_quota(self, user_id: int) -> tuple[bool, str | None]:
         """
         Check if user has remaining quota for today.
@@ -77,23 +117,19 @@ class UsageService:
         Returns:
             tuple: (allowed, error_message)
         """
-        stats = await self.get_user_daily_stats(user_id)
+        total_tasks, total_money = await self._get_daily_totals(user_id)
 
-        if stats:
-            # Check daily task limit
-            if stats.total_tasks >= settings.daily_user_limit_tasks:
-                return False, f"Daily task limit ({settings.daily_user_limit_tasks}) reached"
+        # Check daily task limit
+        if total_tasks >= settings.daily_user_limit_tasks:
+            return False, f"Daily task limit ({settings.daily_user_limit_tasks}) reached"
 
-            # Check daily money limit
-            if stats.total_consume_money >= settings.daily_user_limit_money:
-                return False, f"Daily spending limit (${settings.daily_user_limit_money}) reached"
+        # Check daily money limit
+        if total_money >= settings.daily_user_limit_money:
+            return False, f"Daily spending limit (${settings.daily_user_limit_money}) reached"
 
-        # Check user credits
-        user_result = await self.db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = user_result.scalar_one_or_none()
-        if user and user.credits <= 0:
+        # Check user credits. Read the balance itself rather than trusting any cached copy.
+        credits = await self.db.scalar(select(User.credits).where(User.id == user_id))
+        if credits is not None and credits <= 0:
             return False, "Insufficient credits"
 
         return True, None
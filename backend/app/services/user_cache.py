@@ -0,0 +1,89 @@
+"""Redis cache-aside for the authenticated user lookup.
+
+Every authenticated request resolves `CurrentUser`; caching the profile part of the
+user row lets repeat requests replace `SELECT * FROM users` with a primary-key read of
+the few columns that can change behind the cache's back (account status and credits),
+so a disabled account or a changed balance takes effect on the next request. The
+password hash is never cached.
+"""
+import json
+from datetime import datetime
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import get_settings
+from app.models.user import User
+from app.utils.redis_client import get_redis
+
+settings = get_settings()
+
+_CACHED_FIELDS = (
+    "id",
+    "email",
+    "username",
+    "avatar_url",
+    "is_verified",
+)
+# Always read from the database, even on a cache hit.
+_LIVE_FIELDS = ("is_active", "credits", "credits_used")
+_CACHED_DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+def _cache_key(user_id: int) -> str:
+    return f"auth:user:{user_id}"
+
+
+async def get_cached_user(db: AsyncSession, user_id: int) -> User | None:
+    """Return the cached user attached to `db`, or None on miss.
+
+    Only `_LIVE_FIELDS` are selected on a hit; None is also returned if the row is gone.
+    """
+    try:
+        raw = await get_redis().get(_cache_key(user_id))
+    except RedisError:
+        return None
+    if not raw:
+        return None
+
+    live = (
+        await db.execute(
+            select(*(getattr(User, k) for k in _LIVE_FIELDS)).where(User.id == user_id)
+        )
+    ).one_or_none()
+    if live is None:
+        return None
+
+    data = json.loads(raw)
+    fields = {k: data.get(k) for k in _CACHED_FIELDS}
+    fields.update(live._asdict())
+    for k in _CACHED_DATETIME_FIELDS:
+        fields[k] = datetime.fromisoformat(data[k]) if data.get(k) else None
+
+    # Rebuild a detached instance with an identity key, then attach it without a load so
+    # the endpoint gets a regular persistent object (mutations flush as UPDATEs).
+    user = User(**fields)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+async def cache_user(user: User) -> None:
+    """Store a projection of `user` for `user_cache_ttl` seconds."""
+    data = {k: getattr(user, k) for k in _CACHED_FIELDS}
+    for k in _CACHED_DATETIME_FIELDS:
+        value = getattr(user, k)
+        data[k] = value.isoformat() if value else None
+    try:
+        await get_redis().setex(_cache_key(user.id), settings.user_cache_ttl, json.dumps(data))
+    except RedisError:
+        pass
+
+
+async def invalidate_user(user_id: int) -> None:
+    """Drop the cached user so the next request reloads it from the database."""
+    try:
+        await get_redis().delete(_cache_key(user_id))
+    except RedisError:
+        pass
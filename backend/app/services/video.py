@@ -64,7 +64,6 @@ class VideoService:
         )
         self.db.add(task)
         await self.db.flush()
-        await self.db.refresh(task)
 
         return task
 
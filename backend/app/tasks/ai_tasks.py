@@ -1,27 +1,37 @@
 """Celery tasks for AI processing."""
-import asyncio
+from collections.abc import Iterable
 from datetime import datetime, timezone
 
 from celery import shared_task
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.database import async_session_maker
 from app.models.task import Task, TaskType, TaskStatus
 from app.models.project import Project
-from app.services.runninghub import RunningHubClient, get_app_config
+from app.services.runninghub import RunningHubClient, get_app_config, step_timeout
 from app.services.usage_service import UsageService
-from app.tasks.celery_app import celery_app
+from app.tasks.celery_app import celery_app, run_async
 
+settings = get_settings()
 
-def run_async(coro):
-    """Run async function in sync context."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+# Per step: uploading inputs before polling and attaching the result after it.
+_STEP_OVERHEAD = 600
+
+
+def time_limits(task_types: Iterable[str]) -> tuple[int, int]:
+    """(soft, hard) Celery time limits for running `task_types` one after another.
+
+    Each step may poll for its step_timeout (video: 1h) plus overhead; the hard limit
+    leaves the soft-timeout handler a few minutes to record the failure.
+    """
+    soft = sum(step_timeout(get_app_config(t)) + _STEP_OVERHEAD for t in task_types)
+    return soft, soft + 300
+
+
+# A single step, bounded by the slowest app.
+SUBMIT_SOFT_TIME_LIMIT, SUBMIT_TIME_LIMIT = max(time_limits([t.value]) for t in TaskType)
 
 
 @celery_app.task(bind=True, max_retries=3)
@@ -117,6 +127,7 @@ async def _process_ai_task_async(celery_task, task_id: int):
             )
 
             # Update task with results
+            usage_recorded = False
             if status_response.status in ("SUCCESS", "COMPLETED"):
                 task.status = TaskStatus.SUCCESS
                 task.result_url = status_response.result_url
@@ -133,6 +144,7 @@ async def _process_ai_task_async(celery_task, task_id: int):
                     # Record usage
                     usage_service = UsageService(db)
                     await usage_service.record_task_usage(task, project.user_id)
+                    usage_recorded = True
 
             else:
                 task.status = TaskStatus.FAILED
@@ -140,6 +152,8 @@ async def _process_ai_task_async(celery_task, task_id: int):
                 task.completed_at = datetime.now(timezone.utc)
 
             await db.commit()
+            if usage_recorded:
+                await usage_service.invalidate_daily_totals(project.user_id)
 
             return {
                 "task_id": task_id,
@@ -172,6 +186,23 @@ async def _process_ai_task_async(celery_task, task_id: int):
             raise celery_task.retry(exc=e, countdown=30)
 
 
+@celery_app.task(acks_late=False, soft_time_limit=SUBMIT_SOFT_TIME_LIMIT, time_limit=SUBMIT_TIME_LIMIT)
+def submit_and_poll(task_id: int, task_type: str):
+    """
+    Upload a task's inputs to RunningHub, submit it and poll until it finishes.
+
+    Not acked late: a redelivered job would submit (and bill) the task again.
+    """
+    run_async(_submit_and_poll_async(task_id, task_type))
+
+
+async def _submit_and_poll_async(task_id: int, task_type: str):
+    # Imported lazily: app.api.tasks enqueues this task.
+    from app.api.tasks import submit_and_poll_task
+
+    await submit_and_poll_task(task_id, task_type)
+
+
 @celery_app.task
 def update_task_status(task_id: int):
     """Update task status from RunningHub (for manual polling)."""
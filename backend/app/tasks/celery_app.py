@@ -1,7 +1,11 @@
 """Celery application configuration."""
+import asyncio
+
 from celery import Celery
 
 from app.config import get_settings
+from app.database import engine
+from app.utils.redis_client import close_redis
 
 settings = get_settings()
 
@@ -10,7 +14,7 @@ celery_app = Celery(
     "morphshop",
     broker=settings.redis_url,
     backend=settings.redis_url,
-    include=["app.tasks.ai_tasks", "app.tasks.maintenance"],
+    include=["app.tasks.ai_tasks", "app.tasks.maintenance", "app.tasks.pipeline"],
 )
 
 # Celery configuration
@@ -42,6 +46,31 @@ celery_app.conf.update(
             "task": "app.tasks.maintenance.cleanup_expired_results",
             "schedule": 60 * 60,
             "args": (7,),
-        }
+        },
+        # Fail tasks whose runner died mid-poll so they don't block their project.
+        "fail-stale-tasks": {
+            "task": "app.tasks.maintenance.fail_stale_tasks",
+            "schedule": 5 * 60,
+        },
     },
 )
+
+
+async def _run_and_release(coro):
+    try:
+        return await coro
+    finally:
+        # Pooled asyncpg and Redis connections are bound to the task's event loop; release
+        # them before the loop closes so the next task does not reuse them.
+        await engine.dispose()
+        await close_redis()
+
+
+def run_async(coro):
+    """Run a task's coroutine to completion on a fresh event loop."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(_run_and_release(coro))
+    finally:
+        loop.close()
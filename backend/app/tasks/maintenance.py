@@ -3,23 +3,16 @@
 import asyncio
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, update
 
 from app.database import async_session_maker
 from app.models.asset import Asset, AssetType
-from app.tasks.celery_app import celery_app
+from app.models.task import Task, TaskStatus
+from app.tasks.ai_tasks import SUBMIT_TIME_LIMIT
+from app.tasks.celery_app import celery_app, run_async
 from app.utils.storage import storage
 
 
-def _run_async(coro):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 def _is_external(value: str | None) -> bool:
     return bool(value) and (value.startswith("http://") or value.startswith("https://"))
 
@@ -31,9 +24,9 @@ def cleanup_expired_results(days: int = 7) -> dict:
     Notes:
     - Only deletes result asset types (TRY_ON_RESULT/BACKGROUND_RESULT/VIDEO_RESULT).
     - Uploaded inputs (MODEL_IMAGE/CLOTHING_IMAGE/BACKGROUND_IMAGE) are not touched.
-    - For externally-hosted assets, only the DB record is deleted.
+    - For externally-hosted assets, only the DB record (and any cached download) is deleted.
     """
-    return _run_async(_cleanup_expired_results_async(days))
+    return run_async(_cleanup_expired_results_async(days))
 
 
 async def _cleanup_expired_results_async(days: int) -> dict:
@@ -65,9 +58,40 @@ async def _cleanup_expired_results_async(days: int) -> dict:
             await db.execute(delete(Asset).where(Asset.id.in_(asset_ids)))
             await db.commit()
 
+        # Cached downloads of external results follow the same retention window.
+        pruned = await asyncio.to_thread(storage.prune_external_cache, days * 86400)
+
         return {
             "cutoff": cutoff.isoformat(),
             "deleted_assets": len(asset_ids),
             "deleted_local_files": deleted_files,
+            "pruned_cache_files": pruned,
         }
 
+
+@celery_app.task
+def fail_stale_tasks() -> dict:
+    """Mark tasks stuck in QUEUED/RUNNING past the longest possible run as FAILED.
+
+    A worker or API process that dies mid-poll leaves its task active forever, which
+    also blocks new runs of the project. Such tasks are failed rather than resubmitted:
+    RunningHub may already have accepted (and billed) them.
+    """
+    return run_async(_fail_stale_tasks_async())
+
+
+async def _fail_stale_tasks_async() -> dict:
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=SUBMIT_TIME_LIMIT)
+
+    async with async_session_maker() as db:
+        res = await db.execute(
+            update(Task)
+            .where(Task.status.in_((TaskStatus.QUEUED, TaskStatus.RUNNING)))
+            .where(Task.started_at < cutoff)
+            .values(status=TaskStatus.FAILED, error_message="Task interrupted", completed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    return {"cutoff": cutoff.isoformat(), "failed_tasks": res.rowcount}
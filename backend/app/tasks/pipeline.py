@@ -0,0 +1,24 @@
+"""Celery task that runs a project's workflow pipeline."""
+
+from app.models.task import TaskType
+from app.tasks.ai_tasks import time_limits
+from app.tasks.celery_app import celery_app, run_async
+
+# A run may include every step, back to back.
+_PIPELINE_SOFT_TIME_LIMIT, _PIPELINE_TIME_LIMIT = time_limits([t.value for t in TaskType])
+
+
+@celery_app.task(acks_late=False, soft_time_limit=_PIPELINE_SOFT_TIME_LIMIT, time_limit=_PIPELINE_TIME_LIMIT)
+def run_project_pipeline(project_id: int) -> None:
+    """Run the enabled workflow steps of a project sequentially.
+
+    Not acked late: a redelivered run would resubmit steps that were already billed.
+    """
+    run_async(_run_project_pipeline_async(project_id))
+
+
+async def _run_project_pipeline_async(project_id: int) -> None:
+    # Imported lazily: app.api.projects enqueues this task.
+    from app.api.projects import _run_project_pipeline
+
+    await _run_project_pipeline(project_id)
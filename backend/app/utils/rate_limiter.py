@@ -1,38 +1,93 @@
-"""Rate limiting utilities using slowapi."""
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+"""Rate limiting utilities.
 
-from app.config import get_settings
+`TokenBucketLimiter` (a Redis Lua token bucket) guards the API routes; buckets live in
+Redis so limits hold across all uvicorn workers.
+"""
+import math
+import time
 
-settings = get_settings()
+from fastapi import HTTPException, Request, status
+from redis.exceptions import RedisError
 
-# Create limiter instance
-limiter = Limiter(key_func=get_remote_address)
+from app.utils.redis_client import get_redis
 
 
-def get_user_key(request):
-    """
-    Get rate limit key based on user ID if authenticated,
-    otherwise fall back to IP address.
-    """
-    # Try to get user from request state (set by auth middleware)
-    user = getattr(request.state, "user", None)
-    if user is not None:
-        return f"user:{user.id}"
-    return get_remote_address(request)
+def _client_ip(request: Request) -> str:
+    """Client IP of the request (the proxy's, unless uvicorn runs with --proxy-headers)."""
+    return request.client.host if request.client else "127.0.0.1"
+
+
+# Atomic token bucket. Returns floor(tokens left after taking `cost`); negative means denied.
+# KEYS[1]: bucket key
+# ARGV: capacity, refill rate (tokens per ms), now (ms), cost
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
 
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local remaining = tokens - cost
+if remaining >= 0 then
+    tokens = remaining
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return math.floor(remaining)
+"""
+
+
+class TokenBucketLimiter:
+    """Redis-backed token bucket, used as a FastAPI dependency.
+
+    Example:
+        @router.post("/login", dependencies=[Depends(TokenBucketLimiter(capacity=10, refill_per_sec=10 / 60))])
+    """
 
-# Rate limit decorators
-def rate_limit_default():
-    """Default rate limit decorator."""
-    return limiter.limit(f"{settings.rate_limit_per_minute}/minute")
+    def __init__(self, capacity: int, refill_per_sec: float, cost: int = 1, scope: str | None = None):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.cost = cost
+        # Defaults to the request path; set explicitly to share a bucket across routes.
+        self.scope = scope
+        self._script = None
 
+    def _get_script(self):
+        # redis-py caches the script SHA and uses EVALSHA (falls back to EVAL on NOSCRIPT).
+        if self._script is None:
+            self._script = get_redis().register_script(_TOKEN_BUCKET_LUA)
+        return self._script
 
-def rate_limit_strict():
-    """Strict rate limit for expensive operations."""
-    return limiter.limit("5/minute")
+    async def __call__(self, request: Request) -> None:
+        await self.consume(request, _client_ip(request))
 
+    async def consume(self, request: Request, subject: str) -> None:
+        """Take `cost` tokens from `subject`'s bucket for this route; raise 429 if empty."""
+        key = f"rl:{self.scope or request.url.path}:{subject}"
+        try:
+            remaining = await self._get_script()(
+                keys=[key],
+                args=[self.capacity, self.refill_per_sec / 1000.0, int(time.time() * 1000), self.cost],
+                # Run on the current loop's client, not the one the script was registered on.
+                client=get_redis(),
+            )
+        except RedisError:
+            # Fail open: an unavailable Redis should not lock users out of auth.
+            return
 
-def rate_limit_auth():
-    """Rate limit for authentication endpoints."""
-    return limiter.limit("10/minute")
+        if int(remaining) < 0:
+            retry_after = max(1, math.ceil(self.cost / self.refill_per_sec))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(retry_after)},
+            )
@@ -0,0 +1,30 @@
+"""Shared async Redis client."""
+import asyncio
+import weakref
+
+from redis.asyncio import Redis
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# redis.asyncio connections are bound to the loop that opened them. The API runs a single
+# loop, but Celery tasks run each job on a fresh one (see app.tasks.celery_app.run_async),
+# so keep one client per loop instead of one per process.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = weakref.WeakKeyDictionary()
+
+
+def get_redis() -> Redis:
+    """Get the async Redis client (and its connection pool) for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = Redis.from_url(settings.redis_url, decode_responses=True)
+    return client
+
+
+async def close_redis() -> None:
+    """Close the running loop's client; worker tasks call this before their loop closes."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
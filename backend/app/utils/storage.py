@@ -1,15 +1,51 @@
 """File storage utilities."""
+import asyncio
+import hashlib
 import os
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO
 
 import aiofiles
+from fastapi import UploadFile
 
 from app.config import get_settings
 
 settings = get_settings()
 
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a streamed upload exceeds its size limit."""
+
+
+def _copy_and_hash(src: BinaryIO, dest: Path, max_size: int) -> tuple[int, str]:
+    """Copy `src` to `dest` in chunks; return (size, sha256 hex digest)."""
+    hasher = hashlib.sha256()
+    size = 0
+    with open(dest, "wb") as out:
+        while chunk := src.read(_UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                raise FileTooLargeError(f"File exceeds {max_size} bytes")
+            hasher.update(chunk)
+            out.write(chunk)
+    return size, hasher.hexdigest()
+
+
+@dataclass
+class StagedUpload:
+    """An upload written to a partial file, not yet visible under its final path."""
+    relative_path: str
+    filename: str
+    part_path: Path
+    size: int
+    content_hash: str
+
 
 class StorageService:
     """Local file storage service with cloud storage interface."""
@@ -56,6 +92,61 @@ class StorageService:
         relative_path = f"{subfolder}/{date_path}/{filename}"
         return relative_path, filename
 
+    async def stage_upload(
+        self,
+        upload: UploadFile,
+        original_filename: str,
+        subfolder: str,
+        max_size: int,
+    ) -> StagedUpload:
+        """
+        Stream an uploaded file to a partial file, hashing it on the way.
+
+        Memory use stays bounded and oversized uploads stop at the limit. The caller
+        decides from the hash whether to keep the file (`commit_upload`) or drop it
+        (`discard_upload`, e.g. when the same bytes are already stored).
+
+        Raises:
+            FileTooLargeError: If the upload exceeds `max_size` bytes.
+        """
+        filename = self._generate_filename(original_filename)
+        date_path = self._get_date_path()
+
+        dir_path = self.base_dir / subfolder / date_path
+        dir_path.mkdir(parents=True, exist_ok=True)
+        part_path = dir_path / f".{filename}.part"
+
+        try:
+            # One worker thread does the whole read/hash/write loop: hashlib releases the GIL
+            # on large blocks, so concurrent uploads hash in parallel and the event loop
+            # never runs SHA-256 itself.
+            size, content_hash = await asyncio.to_thread(_copy_and_hash, upload.file, part_path, max_size)
+        except BaseException:
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
+            raise
+
+        return StagedUpload(
+            relative_path=f"{subfolder}/{date_path}/{filename}",
+            filename=filename,
+            part_path=part_path,
+            size=size,
+            content_hash=content_hash,
+        )
+
+    def commit_upload(self, staged: StagedUpload) -> None:
+        """Move a staged upload to its final path."""
+        os.replace(staged.part_path, self.base_dir / staged.relative_path)
+
+    def discard_upload(self, staged: StagedUpload) -> None:
+        """Remove a staged upload's partial file (no-op once committed)."""
+        try:
+            os.remove(staged.part_path)
+        except OSError:
+            pass
+
     async def delete_file(self, relative_path: str) -> bool:
         """Delete file from storage."""
         file_path = self.base_dir / relative_path
@@ -80,6 +171,24 @@ class StorageService:
         """Get absolute filesystem path for file."""
         return self.base_dir / relative_path
 
+    def external_cache_path(self, url: str) -> Path:
+        """Get the local cache path for a downloaded external (e.g. RunningHub) file."""
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.base_dir / "cache" / key[:2] / key
+
+    def prune_external_cache(self, max_age_seconds: float) -> int:
+        """Delete cached external downloads older than `max_age_seconds`."""
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for path in (self.base_dir / "cache").glob("*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
 
 # Global storage instance
 storage = StorageService()
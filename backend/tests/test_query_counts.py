@@ -0,0 +1,161 @@
+"""Statement-count guards for the project and task read paths.
+
+Relationships not covered by a route's loader options raise (raiseload / raise_on_sql)
+instead of lazy-loading, so these tests also fail if serializing a response would need
+a relationship the query did not load.
+"""
+import pytest
+
+from app.api import tasks as tasks_api
+from app.models.asset import Asset, AssetType
+from app.models.project import Project
+from app.models.task import Task, TaskStatus, TaskType
+
+
+async def _make_asset(db, user, asset_type: AssetType) -> Asset:
+    asset = Asset(
+        user_id=user.id,
+        filename=f"{asset_type.value}.png",
+        original_filename=f"{asset_type.value}.png",
+        file_path=f"images/{asset_type.value}.png",
+        file_url=f"/api/files/images/{asset_type.value}.png",
+        asset_type=asset_type,
+        mime_type="image/png",
+        file_size=1,
+    )
+    db.add(asset)
+    await db.flush()
+    return asset
+
+
+async def _make_project(db, user, name: str = "p") -> Project:
+    model = await _make_asset(db, user, AssetType.MODEL_IMAGE)
+    clothing = await _make_asset(db, user, AssetType.CLOTHING_IMAGE)
+    result = await _make_asset(db, user, AssetType.TRY_ON_RESULT)
+    project = Project(
+        user_id=user.id,
+        name=name,
+        workflow_steps=["try_on", "background", "video"],
+        model_image_id=model.id,
+        clothing_image_id=clothing.id,
+        try_on_result_id=result.id,
+    )
+    db.add(project)
+    await db.flush()
+    return project
+
+
+@pytest.fixture
+async def project(session_maker, user) -> Project:
+    async with session_maker() as db:
+        project = await _make_project(db, user)
+        await db.commit()
+    return project
+
+
+@pytest.fixture
+async def project_tasks(session_maker, project) -> list[Task]:
+    async with session_maker() as db:
+        tasks = [
+            Task(
+                project_id=project.id,
+                task_type=TaskType.TRY_ON,
+                status=TaskStatus.SUCCESS,
+                result_asset_id=project.try_on_result_id,
+                input_params={"model_image_id": project.model_image_id},
+            )
+            for _ in range(5)
+        ]
+        db.add_all(tasks)
+        await db.commit()
+    return tasks
+
+
+@pytest.fixture
+def no_task_list_cache(monkeypatch):
+    # Ids restart with every test database; never serve a list cached by an earlier test.
+    async def miss(key):
+        return None
+
+    async def skip(key, body, ttl):
+        return None
+
+    monkeypatch.setattr(tasks_api, "get_cached_body", miss)
+    monkeypatch.setattr(tasks_api, "cache_body", skip)
+
+
+async def test_get_project_is_one_query(client, count_queries, project):
+    with count_queries() as statements:
+        response = await client.get(f"/api/projects/{project.id}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["model_image"]["id"] == project.model_image_id
+    assert body["try_on_result"]["id"] == project.try_on_result_id
+    assert len(statements) == 1
+
+
+async def test_update_project_does_not_lazy_load(client, count_queries, project):
+    with count_queries() as statements:
+        response = await client.patch(f"/api/projects/{project.id}", json={"name": "renamed"})
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "renamed"
+    # SELECT with joined assets + UPDATE ... RETURNING.
+    assert len(statements) <= 2
+
+
+async def test_cancel_pipeline_does_not_lazy_load(client, count_queries, project):
+    with count_queries() as statements:
+        response = await client.post(f"/api/projects/{project.id}/pipeline/cancel")
+
+    assert response.status_code == 200
+    assert response.json()["pipeline_cancel_requested"] is True
+    assert len(statements) <= 2
+
+
+async def test_list_projects_query_count_does_not_grow(client, count_queries, session_maker, user, project):
+    with count_queries() as single:
+        response = await client.get("/api/projects")
+    assert response.status_code == 200
+
+    async with session_maker() as db:
+        for i in range(3):
+            await _make_project(db, user, name=f"p{i}")
+        await db.commit()
+
+    with count_queries() as several:
+        response = await client.get("/api/projects")
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 4
+    assert len(several) == len(single)
+
+
+async def test_get_project_tasks_query_count(client, count_queries, project, project_tasks, no_task_list_cache):
+    with count_queries() as statements:
+        response = await client.get(f"/api/tasks/project/{project.id}")
+
+    assert response.status_code == 200
+    assert len(response.json()) == len(project_tasks)
+    assert len(statements) <= 2
+
+
+async def test_get_task_query_count(client, count_queries, project_tasks):
+    task = project_tasks[0]
+    with count_queries() as statements:
+        response = await client.get(f"/api/tasks/{task.id}")
+
+    assert response.status_code == 200
+    assert response.json()["project_id"] == task.project_id
+    assert len(statements) <= 2
+
+
+async def test_get_task_status_query_count(client, count_queries, project_tasks):
+    task = project_tasks[0]
+    with count_queries() as statements:
+        response = await client.get(f"/api/tasks/{task.id}/status")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == TaskStatus.SUCCESS.value
+    assert len(statements) <= 2
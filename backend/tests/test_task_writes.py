@@ -0,0 +1,126 @@
+"""Concurrency guards on the task write paths: the submit claim, the webhook's SKIP LOCKED
+read and the stale-task sweep."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+import app.database
+import app.services.runninghub
+from app.api.tasks import submit_and_poll_task
+from app.models.project import Project
+from app.models.task import Task, TaskStatus, TaskType
+from app.tasks import maintenance
+from app.tasks.ai_tasks import SUBMIT_TIME_LIMIT
+
+
+@pytest.fixture
+async def project(session_maker, user) -> Project:
+    async with session_maker() as db:
+        project = Project(user_id=user.id, name="p")
+        db.add(project)
+        await db.commit()
+    return project
+
+
+async def _make_task(session_maker, project, **values) -> Task:
+    async with session_maker() as db:
+        task = Task(project_id=project.id, task_type=TaskType.TRY_ON, input_params={}, **values)
+        db.add(task)
+        await db.commit()
+    return task
+
+
+async def _get_task(session_maker, task_id: int) -> Task:
+    async with session_maker() as db:
+        return await db.get(Task, task_id)
+
+
+@pytest.fixture
+def runninghub_clients(session_maker, monkeypatch) -> list:
+    """Run submit_and_poll_task on the test database; collects the RunningHub clients it opens."""
+    monkeypatch.setattr(app.database, "async_session_maker", session_maker)
+    clients = []
+    client_cls = app.services.runninghub.RunningHubClient
+
+    def make_client(*args, **kwargs):
+        client = client_cls(*args, **kwargs)
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(app.services.runninghub, "RunningHubClient", make_client)
+    return clients
+
+
+async def test_duplicate_submit_claims_the_task_once(session_maker, project, runninghub_clients):
+    # No input assets: the claimed run fails before contacting RunningHub.
+    task = await _make_task(session_maker, project)
+
+    await asyncio.gather(
+        submit_and_poll_task(task.id, "try_on"),
+        submit_and_poll_task(task.id, "try_on"),
+    )
+
+    assert len(runninghub_clients) == 1
+    task = await _get_task(session_maker, task.id)
+    assert task.status == TaskStatus.FAILED
+    assert task.error_message == "Asset not found"
+    assert task.started_at is not None
+
+
+async def test_submit_skips_a_task_that_is_no_longer_pending(session_maker, project, runninghub_clients):
+    task = await _make_task(session_maker, project, status=TaskStatus.RUNNING)
+
+    await submit_and_poll_task(task.id, "try_on")
+
+    assert runninghub_clients == []
+    task = await _get_task(session_maker, task.id)
+    assert task.status == TaskStatus.RUNNING
+    assert task.started_at is None
+
+
+async def test_webhook_skips_a_task_locked_by_the_poller(client, session_maker, project):
+    task = await _make_task(session_maker, project, status=TaskStatus.RUNNING, runninghub_task_id="rh-1")
+    payload = {"taskId": "rh-1", "status": "FAILED", "errorMsg": "boom"}
+
+    async with session_maker() as poller:
+        await poller.execute(select(Task).where(Task.id == task.id).with_for_update())
+        response = await client.post("/api/tasks/webhook/runninghub", json=payload)
+        await poller.rollback()
+
+    assert response.json() == {"status": "ignored", "reason": "task not found or busy"}
+    assert (await _get_task(session_maker, task.id)).status == TaskStatus.RUNNING
+
+    # Once the lock is released the callback is applied.
+    response = await client.post("/api/tasks/webhook/runninghub", json=payload)
+    assert response.json() == {"status": "ok"}
+    task = await _get_task(session_maker, task.id)
+    assert task.status == TaskStatus.FAILED
+    assert task.error_message == "boom"
+
+
+async def test_fail_stale_tasks_only_fails_interrupted_tasks(session_maker, project, monkeypatch):
+    monkeypatch.setattr(maintenance, "async_session_maker", session_maker)
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=SUBMIT_TIME_LIMIT + 60)
+    tasks = {
+        "stale_queued": await _make_task(session_maker, project, status=TaskStatus.QUEUED, started_at=stale),
+        "stale_running": await _make_task(session_maker, project, status=TaskStatus.RUNNING, started_at=stale),
+        "fresh_running": await _make_task(session_maker, project, status=TaskStatus.RUNNING, started_at=now),
+        "finished": await _make_task(session_maker, project, status=TaskStatus.SUCCESS, started_at=stale),
+    }
+
+    result = await maintenance._fail_stale_tasks_async()
+
+    assert result["failed_tasks"] == 2
+    statuses = {name: (await _get_task(session_maker, t.id)).status for name, t in tasks.items()}
+    assert statuses == {
+        "stale_queued": TaskStatus.FAILED,
+        "stale_running": TaskStatus.FAILED,
+        "fresh_running": TaskStatus.RUNNING,
+        "finished": TaskStatus.SUCCESS,
+    }
+    failed = await _get_task(session_maker, tasks["stale_running"].id)
+    assert failed.error_message == "Task interrupted"
+    assert failed.completed_at is not None
@@ -0,0 +1,41 @@
+"""Upload dedupe: re-uploading the same bytes reuses the stored asset."""
+import pytest
+
+from app.utils.storage import storage
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "base_dir", tmp_path)
+    return tmp_path
+
+
+def _stored_files(root):
+    return sorted(p.name for p in root.rglob("*") if p.is_file())
+
+
+async def test_reupload_reuses_asset_without_storing_a_copy(client, upload_dir):
+    data = {"asset_type": "model_image"}
+    first = await client.post("/api/upload/image", data=data, files={"file": ("a.png", b"same bytes", "image/png")})
+    assert first.status_code == 201
+    assert first.json()["reused"] is False
+    stored = _stored_files(upload_dir)
+    assert len(stored) == 1
+
+    second = await client.post("/api/upload/image", data=data, files={"file": ("b.png", b"same bytes", "image/png")})
+    assert second.status_code == 201
+    assert second.json()["id"] == first.json()["id"]
+    assert second.json()["reused"] is True
+    assert second.json()["original_filename"] == "a.png"
+    # Neither the new copy nor its partial file is left behind.
+    assert _stored_files(upload_dir) == stored
+
+
+async def test_different_bytes_are_stored_separately(client, upload_dir):
+    data = {"asset_type": "model_image"}
+    first = await client.post("/api/upload/image", data=data, files={"file": ("a.png", b"one", "image/png")})
+    second = await client.post("/api/upload/image", data=data, files={"file": ("a.png", b"two", "image/png")})
+
+    assert first.json()["id"] != second.json()["id"]
+    assert second.json()["reused"] is False
+    assert len(_stored_files(upload_dir)) == 2
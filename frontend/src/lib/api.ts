@@ -242,8 +242,12 @@ class ApiClient {
     return this.request<TaskStatus>(`/tasks/${taskId}/status`);
   }
 
-  async getProjectTasks(projectId: number) {
-    return this.request<Task[]>(`/tasks/project/${projectId}`);
+  async getProjectTasks(projectId: number, params: { limit?: number; offset?: number } = {}) {
+    const qs = new URLSearchParams();
+    if (params.limit != null) qs.set("limit", String(params.limit));
+    if (params.offset != null) qs.set("offset", String(params.offset));
+    const suffix = qs.toString() ? `?${qs.toString()}` : "";
+    return this.request<Task[]>(`/tasks/project/${projectId}${suffix}`);
   }
 
   // Asset endpoints
@@ -257,10 +261,15 @@ class ApiClient {
     return this.request<Asset[]>(`/assets${suffix}`);
   }
 
-  async getProjectResults(projectId: number, params: { task_type?: string; days?: number } = {}) {
+  async getProjectResults(
+    projectId: number,
+    params: { task_type?: string; days?: number; limit?: number; offset?: number } = {}
+  ) {
     const qs = new URLSearchParams();
     if (params.task_type) qs.set("task_type", params.task_type);
     if (params.days != null) qs.set("days", String(params.days));
+    if (params.limit != null) qs.set("limit", String(params.limit));
+    if (params.offset != null) qs.set("offset", String(params.offset));
     const suffix = qs.toString() ? `?${qs.toString()}` : "";
     return this.request<Asset[]>(`/projects/${projectId}/results${suffix}`);
   }
@@ -482,6 +491,8 @@ export interface AssetUpload {
   original_filename: string;
   asset_type: string;
   display_name?: string | null;
+  // The same file was uploaded before; this is that (existing) asset.
+  reused?: boolean;
 }
 
 export interface Asset {